@@ -0,0 +1,45 @@
+"""add brand regions
+
+Revision ID: 4f1d2a7c9b3e
+Revises: af12692d6f0d
+Create Date: 2026-10-17 10:12:41.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1d2a7c9b3e'
+down_revision: Union[str, Sequence[str], None] = 'af12692d6f0d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('brand_regions',
+    sa.Column('brand_id', sa.Uuid(), nullable=False),
+    sa.Column('region', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['brand_id'], ['brands.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('brand_id', 'region')
+    )
+    op.create_index('ix_brand_regions_region_brand_id', 'brand_regions', ['region', 'brand_id'], unique=False)
+
+    # Backfill from the JSON column
+    op.execute("""
+        INSERT INTO brand_regions (brand_id, region)
+        SELECT DISTINCT b.id, r.region
+        FROM brands b, json_array_elements_text(b.regions_present) AS r(region)
+        WHERE b.regions_present IS NOT NULL
+          AND json_typeof(b.regions_present) = 'array'
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_brand_regions_region_brand_id', table_name='brand_regions')
+    op.drop_table('brand_regions')
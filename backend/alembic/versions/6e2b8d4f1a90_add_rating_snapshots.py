@@ -0,0 +1,38 @@
+"""add rating snapshots
+
+Revision ID: 6e2b8d4f1a90
+Revises: a2c6e8f0b413
+Create Date: 2026-10-17 13:41:07.382915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2b8d4f1a90'
+down_revision: Union[str, Sequence[str], None] = 'a2c6e8f0b413'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rating_snapshots',
+    sa.Column('brand_id', sa.Uuid(), nullable=False),
+    sa.Column('taken_at', sa.DateTime(), nullable=False),
+    sa.Column('elo', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['brand_id'], ['brands.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('brand_id', 'taken_at')
+    )
+    op.create_index(op.f('ix_rating_snapshots_taken_at'), 'rating_snapshots', ['taken_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_rating_snapshots_taken_at'), table_name='rating_snapshots')
+    op.drop_table('rating_snapshots')
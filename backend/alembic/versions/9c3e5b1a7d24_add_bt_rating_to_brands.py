@@ -0,0 +1,31 @@
+"""add bt_rating to brands
+
+Revision ID: 9c3e5b1a7d24
+Revises: 4f1d2a7c9b3e
+Create Date: 2026-10-17 11:02:19.604418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e5b1a7d24'
+down_revision: Union[str, Sequence[str], None] = '4f1d2a7c9b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('brands', sa.Column('bt_rating', sa.Float(), nullable=True))
+    op.create_index(op.f('ix_brands_bt_rating'), 'brands', ['bt_rating'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_brands_bt_rating'), table_name='brands')
+    op.drop_column('brands', 'bt_rating')
@@ -0,0 +1,44 @@
+"""add brand keyset indexes
+
+Revision ID: a2c6e8f0b413
+Revises: 9c3e5b1a7d24
+Create Date: 2026-10-17 12:20:44.530127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c6e8f0b413'
+down_revision: Union[str, Sequence[str], None] = '9c3e5b1a7d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One index per cursor-paginated ordering, built without blocking votes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_brands_name_id', 'brands', ['name', 'id'], unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_brands_elo_desc_id', 'brands', [sa.text('elo DESC'), 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_brands_bt_rating_desc_id', 'brands', [sa.text('bt_rating DESC NULLS LAST'), 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_brands_bt_rating_desc_id', table_name='brands', postgresql_concurrently=True)
+        op.drop_index('ix_brands_elo_desc_id', table_name='brands', postgresql_concurrently=True)
+        op.drop_index('ix_brands_name_id', table_name='brands', postgresql_concurrently=True)
@@ -0,0 +1,42 @@
+"""add match history indexes
+
+Revision ID: b7a1c3e9d052
+Revises: 6e2b8d4f1a90
+Create Date: 2026-10-17 14:26:53.114208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7a1c3e9d052'
+down_revision: Union[str, Sequence[str], None] = '6e2b8d4f1a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ELO_COLUMNS = ['winner_elo_before', 'winner_elo_after', 'loser_elo_before', 'loser_elo_after', 'is_tie']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so votes keep flowing while a large matches table is indexed
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_matches_winner_id_timestamp', 'matches', ['winner_id', 'timestamp', 'id'],
+            unique=False, postgresql_include=['loser_id', *ELO_COLUMNS], postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_matches_loser_id_timestamp', 'matches', ['loser_id', 'timestamp', 'id'],
+            unique=False, postgresql_include=['winner_id', *ELO_COLUMNS], postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_matches_loser_id_timestamp', table_name='matches', postgresql_concurrently=True)
+        op.drop_index('ix_matches_winner_id_timestamp', table_name='matches', postgresql_concurrently=True)
@@ -0,0 +1,50 @@
+"""add head to head rivals indexes
+
+Revision ID: c8d2e4f6a1b7
+Revises: f1a4b7c2e938
+Create Date: 2026-10-17 19:55:31.208416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2e4f6a1b7'
+down_revision: Union[str, Sequence[str], None] = 'f1a4b7c2e938'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RIVAL_ORDER = [sa.text('(low_wins + high_wins + ties) DESC'), sa.text('last_played_at DESC NULLS LAST')]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so votes keep upserting pairs; the high-side index
+    # also serves brand_high_id lookups, replacing the single-column one
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_head_to_head_low_rivals', 'head_to_head', ['brand_low_id', *RIVAL_ORDER],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_head_to_head_high_rivals', 'head_to_head', ['brand_high_id', *RIVAL_ORDER],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_head_to_head_brand_high_id', table_name='head_to_head', postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_head_to_head_brand_high_id', 'head_to_head', ['brand_high_id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.drop_index('ix_head_to_head_high_rivals', table_name='head_to_head', postgresql_concurrently=True)
+        op.drop_index('ix_head_to_head_low_rivals', table_name='head_to_head', postgresql_concurrently=True)
@@ -0,0 +1,56 @@
+"""add head to head
+
+Revision ID: d3f8a2b6c471
+Revises: b7a1c3e9d052
+Create Date: 2026-10-17 15:08:32.640197
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f8a2b6c471'
+down_revision: Union[str, Sequence[str], None] = 'b7a1c3e9d052'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('head_to_head',
+    sa.Column('brand_low_id', sa.Uuid(), nullable=False),
+    sa.Column('brand_high_id', sa.Uuid(), nullable=False),
+    sa.Column('low_wins', sa.Integer(), nullable=False),
+    sa.Column('high_wins', sa.Integer(), nullable=False),
+    sa.Column('ties', sa.Integer(), nullable=False),
+    sa.Column('last_played_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['brand_high_id'], ['brands.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['brand_low_id'], ['brands.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('brand_low_id', 'brand_high_id')
+    )
+    op.create_index(op.f('ix_head_to_head_brand_high_id'), 'head_to_head', ['brand_high_id'], unique=False)
+
+    # Backfill from the match log (matches against deleted brands are dropped)
+    op.execute("""
+        INSERT INTO head_to_head (brand_low_id, brand_high_id, low_wins, high_wins, ties, last_played_at)
+        SELECT LEAST(m.winner_id, m.loser_id), GREATEST(m.winner_id, m.loser_id),
+               COUNT(*) FILTER (WHERE NOT m.is_tie AND m.winner_id < m.loser_id),
+               COUNT(*) FILTER (WHERE NOT m.is_tie AND m.winner_id > m.loser_id),
+               COUNT(*) FILTER (WHERE m.is_tie),
+               MAX(m.timestamp)
+        FROM matches m
+        JOIN brands w ON w.id = m.winner_id
+        JOIN brands l ON l.id = m.loser_id
+        WHERE m.winner_id <> m.loser_id
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_head_to_head_brand_high_id'), table_name='head_to_head')
+    op.drop_table('head_to_head')
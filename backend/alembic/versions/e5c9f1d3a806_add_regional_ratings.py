@@ -0,0 +1,45 @@
+"""add regional ratings
+
+Revision ID: e5c9f1d3a806
+Revises: d3f8a2b6c471
+Create Date: 2026-10-17 16:02:45.918330
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c9f1d3a806'
+down_revision: Union[str, Sequence[str], None] = 'd3f8a2b6c471'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('regional_ratings',
+    sa.Column('region', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('brand_id', sa.Uuid(), nullable=False),
+    sa.Column('elo', sa.Integer(), nullable=False),
+    sa.Column('tier', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('ties', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['brand_id'], ['brands.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('region', 'brand_id')
+    )
+    op.create_index(
+        'ix_regional_ratings_region_elo_brand_id', 'regional_ratings',
+        ['region', sa.text('elo DESC'), 'brand_id'], unique=False,
+    )
+    # Existing history is backfilled by scripts/rebuild_ratings.py --engine regional
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_regional_ratings_region_elo_brand_id', table_name='regional_ratings')
+    op.drop_table('regional_ratings')
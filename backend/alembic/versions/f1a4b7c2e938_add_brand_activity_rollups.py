@@ -0,0 +1,45 @@
+"""add brand activity rollups
+
+Revision ID: f1a4b7c2e938
+Revises: e5c9f1d3a806
+Create Date: 2026-10-17 16:47:19.502673
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a4b7c2e938'
+down_revision: Union[str, Sequence[str], None] = 'e5c9f1d3a806'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['brand_activity_hourly', 'brand_activity_daily']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.create_table(table,
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('brand_id', sa.Uuid(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('losses', sa.Integer(), nullable=False),
+        sa.Column('ties', sa.Integer(), nullable=False),
+        sa.Column('elo_change', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['brand_id'], ['brands.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('bucket', 'brand_id')
+        )
+        op.create_index(op.f(f'ix_{table}_brand_id'), table, ['brand_id'], unique=False)
+    # Existing history is backfilled by scripts/compact_activity.py --rebuild
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_index(op.f(f'ix_{table}_brand_id'), table_name=table)
+        op.drop_table(table)
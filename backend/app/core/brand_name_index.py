@@ -0,0 +1,274 @@
+import bisect
+import heapq
+import uuid
+from collections import defaultdict
+from typing import Callable, Mapping
+
+from rapidfuzz import fuzz, process
+from sqlmodel import Session, select
+from thefuzz import utils as fuzz_utils
+
+from app.core.fuzzy_bounds import WRatioBounds
+from app.core.memory_index import MemoryIndex
+from app.models.brand import Brand
+
+# Same cut-off DiscoveryService has always used for "this is the same brand"
+MATCH_THRESHOLD = 85
+NGRAM_SIZE = 3
+
+# Brands a fuzzy lookup scores per step, highest WRatio upper bound first
+SCORE_BATCH_SIZE = 64
+
+# Search match quality, best first
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+
+def _short_prefixes(processed_name: str) -> tuple[set[str], set[str]]:
+    """1-2 character prefixes of the name, and of each of its later words."""
+    first, *rest = processed_name.split() or [""]
+    name_prefixes = {first[:length] for length in range(1, NGRAM_SIZE) if first[:length]}
+    word_prefixes = {word[:length] for word in rest for length in range(1, NGRAM_SIZE)}
+    return name_prefixes, word_prefixes
+
+
+def _ngrams(processed_name: str) -> set[str]:
+    padded = f" {processed_name} "
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+class BrandNameIndex(MemoryIndex):
+    """
+    Fuzzy brand-name lookup used by discovery.
+
+    Names are normalised once with thefuzz's `full_process`. A lookup ranks
+    brands by a cheap upper bound on their WRatio (WRatioBounds) and scores
+    them in that order, stopping once no remaining bound can beat the best
+    score so far. Brands that can't reach the threshold are never scored.
+    The result has the score `thefuzz.process.extractOne` would find over
+    the whole catalogue; between equal scores the chosen brand may differ.
+    Scoring is rapidfuzz's WRatio rounded like thefuzz.
+
+    Trigram postings serve the search box: `search` and `autocomplete`
+    intersect the query's trigrams and rank substring hits by match quality.
+    Queries shorter than a trigram (the first keystrokes of autocomplete) are
+    looked up in a map of 1-2 character name and word prefixes instead, so
+    they only match at the start of a word.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._names: dict[uuid.UUID, str] = {}
+        self._logos: dict[uuid.UUID, str | None] = {}
+        self._processed: dict[uuid.UUID, str] = {}
+        self._postings: dict[str, set[uuid.UUID]] = defaultdict(set)
+        self._bounds = WRatioBounds()
+        # Short prefix -> [(len, name, str(id), id)], kept sorted in search order
+        self._name_prefixes: dict[str, list[tuple]] = defaultdict(list)
+        self._word_prefixes: dict[str, list[tuple]] = defaultdict(list)
+
+    def _fetch(self, session: Session) -> list[tuple[uuid.UUID, str, str | None]]:
+        return session.exec(select(Brand.id, Brand.name, Brand.logo_url)).all()
+
+    def _install(self, rows: list[tuple[uuid.UUID, str, str | None]]) -> None:
+        self._names = {}
+        self._logos = {}
+        self._processed = {}
+        self._postings = defaultdict(set)
+        self._bounds = WRatioBounds()
+        self._name_prefixes = defaultdict(list)
+        self._word_prefixes = defaultdict(list)
+        for brand_id, name, logo_url in rows:
+            self._insert(brand_id, name, logo_url)
+
+    def _insert(self, brand_id: uuid.UUID, name: str, logo_url: str | None = None) -> None:
+        processed = fuzz_utils.full_process(name)
+        self._names[brand_id] = name
+        self._logos[brand_id] = logo_url
+        self._processed[brand_id] = processed
+        for gram in _ngrams(processed):
+            self._postings[gram].add(brand_id)
+        self._bounds.add(brand_id, processed)
+        entry = self._sort_key(brand_id, processed)
+        for buckets, prefixes in zip((self._name_prefixes, self._word_prefixes), _short_prefixes(processed)):
+            for prefix in prefixes:
+                bisect.insort(buckets[prefix], entry)
+
+    def _delete(self, brand_id: uuid.UUID) -> None:
+        processed = self._processed.pop(brand_id, None)
+        self._names.pop(brand_id, None)
+        self._logos.pop(brand_id, None)
+        self._bounds.remove(brand_id)
+        if processed is None:
+            return
+        for gram in _ngrams(processed):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(brand_id)
+                if not ids:
+                    del self._postings[gram]
+        entry = self._sort_key(brand_id, processed)
+        for buckets, prefixes in zip((self._name_prefixes, self._word_prefixes), _short_prefixes(processed)):
+            for prefix in prefixes:
+                bucket = buckets.get(prefix)
+                if bucket is None:
+                    continue
+                i = bisect.bisect_left(bucket, entry)
+                if i < len(bucket) and bucket[i] == entry:
+                    del bucket[i]
+                if not bucket:
+                    del buckets[prefix]
+
+    @staticmethod
+    def _sort_key(brand_id: uuid.UUID, processed: str) -> tuple:
+        return (len(processed), processed, str(brand_id), brand_id)
+
+    def add(self, brand_id: uuid.UUID, name: str, logo_url: str | None = None) -> None:
+        with self._lock:
+            if self.is_ready:
+                self._insert(brand_id, name, logo_url)
+
+    def update(self, brand_id: uuid.UUID, name: str, logo_url: str | None = None) -> None:
+        with self._lock:
+            if self.is_ready:
+                self._delete(brand_id)
+                self._insert(brand_id, name, logo_url)
+
+    def remove(self, brand_id: uuid.UUID) -> None:
+        with self._lock:
+            if self.is_ready:
+                self._delete(brand_id)
+
+    def best_match(
+        self, name: str, extra_names: Mapping[uuid.UUID, str] | None = None
+    ) -> uuid.UUID | None:
+        """
+        Returns the id of the brand whose name scores >= MATCH_THRESHOLD
+        against `name`, or None. `extra_names` are scored alongside the index
+        (e.g. brands created earlier in the same, uncommitted request).
+        """
+        query = fuzz_utils.full_process(name)
+        if not query:
+            return None
+
+        extra = {
+            brand_id: fuzz_utils.full_process(extra_name)
+            for brand_id, extra_name in (extra_names or {}).items()
+        }
+
+        # Anything thefuzz would round to MATCH_THRESHOLD
+        cutoff = MATCH_THRESHOLD - 0.5
+        best = self._extract(query, extra, cutoff)
+        with self._lock:
+            for bound, brand_ids, names in self._bounds.ranked(query, cutoff, SCORE_BATCH_SIZE):
+                # Equal scores can't change the answer, only higher ones
+                floor = best[1] + 1e-9 if best else cutoff
+                if bound < floor:
+                    break
+                challenger = self._extract(query, dict(zip(brand_ids, names)), floor)
+                if challenger is not None:
+                    best = challenger
+
+        # thefuzz rounds WRatio to an int before comparing against the threshold
+        return best[0] if best and round(best[1]) >= MATCH_THRESHOLD else None
+
+    @staticmethod
+    def _extract(
+        query: str, choices: Mapping[uuid.UUID, str], score_cutoff: float
+    ) -> tuple[uuid.UUID, float] | None:
+        """Best (brand_id, WRatio) scoring at least `score_cutoff`, if any."""
+        if not choices:
+            return None
+        result = process.extractOne(
+            query, choices, scorer=fuzz.WRatio, processor=None, score_cutoff=score_cutoff,
+        )
+        if result is None:
+            return None
+        _, score, brand_id = result
+        return brand_id, score
+
+    def search(
+        self, term: str, limit: int | None = None, prefix_only: bool = False,
+        eligible: Callable[[uuid.UUID], bool] | None = None,
+    ) -> list[uuid.UUID]:
+        """
+        Ids of brands whose name contains `term`, best match first: exact
+        name, then name prefix, then word prefix, then any substring. Ties go
+        to the shorter name, then alphabetically. `prefix_only` drops plain
+        substring hits; `eligible` filters ids (e.g. by region). Terms
+        shorter than a trigram only match name and word prefixes.
+        """
+        query = fuzz_utils.full_process(term)
+        if not query:
+            return []
+
+        with self._lock:
+            if len(query) >= NGRAM_SIZE:
+                grams = sorted(
+                    (self._postings.get(query[i:i + NGRAM_SIZE], set())
+                     for i in range(len(query) - NGRAM_SIZE + 1)),
+                    key=len,
+                )
+                candidate_ids = set(grams[0]).intersection(*grams[1:])
+            else:
+                return self._search_short(query, limit, eligible)
+
+            hits = []
+            for brand_id in candidate_ids:
+                if eligible is not None and not eligible(brand_id):
+                    continue
+                processed = self._processed[brand_id]
+                quality = self._match_quality(query, processed)
+                if quality is None or (prefix_only and quality == SUBSTRING):
+                    continue
+                hits.append((quality, len(processed), processed, str(brand_id), brand_id))
+
+        ranked = heapq.nsmallest(limit, hits) if limit is not None else sorted(hits)
+        return [hit[-1] for hit in ranked]
+
+    def _search_short(
+        self, query: str, limit: int | None, eligible: Callable[[uuid.UUID], bool] | None,
+    ) -> list[uuid.UUID]:
+        """
+        Name prefix hits, then word prefix hits, walked in ranking order so
+        only the first `limit` eligible brands are visited. Within the name
+        bucket an exact name is also the shortest, so it still comes first.
+        """
+        ids: list[uuid.UUID] = []
+        for buckets, quality in ((self._name_prefixes, PREFIX), (self._word_prefixes, WORD_PREFIX)):
+            for _, processed, _, brand_id in buckets.get(query, ()):
+                if limit is not None and len(ids) >= limit:
+                    return ids
+                # Also a name prefix hit, already taken from the first bucket
+                if quality == WORD_PREFIX and processed.startswith(query):
+                    continue
+                if eligible is not None and not eligible(brand_id):
+                    continue
+                ids.append(brand_id)
+        return ids
+
+    def autocomplete(
+        self, prefix: str, limit: int = 10,
+        eligible: Callable[[uuid.UUID], bool] | None = None,
+    ) -> list[tuple[uuid.UUID, str, str | None]]:
+        """Top `limit` (id, name, logo_url) whose name or one of its words starts with `prefix`."""
+        ids = self.search(prefix, limit=limit, prefix_only=True, eligible=eligible)
+        with self._lock:
+            return [
+                (brand_id, self._names[brand_id], self._logos.get(brand_id))
+                for brand_id in ids if brand_id in self._names
+            ]
+
+    @staticmethod
+    def _match_quality(query: str, processed: str) -> int | None:
+        if processed == query:
+            return EXACT
+        if processed.startswith(query):
+            return PREFIX
+        if f" {query}" in processed:
+            return WORD_PREFIX
+        if query in processed:
+            return SUBSTRING
+        return None
+
+
+brand_name_index = BrandNameIndex()
@@ -3,8 +3,49 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     DATABASE_URL: str
 
+    # Serve the hot read/vote endpoints from async routes on an AsyncSession.
+    # ASYNC_DATABASE_URL defaults to DATABASE_URL with the asyncpg driver.
+    ASYNC_DB: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+    ASYNC_POOL_SIZE: int = 20
+
+    # In-memory indexes are per-process; reload them from the database this often
+    # so writes from other workers and scripts are picked up.
+    INDEX_RESYNC_SECONDS: float = 30.0
+    # When disabled, ranks are computed by a single RANK() OVER query per request.
+    RANK_INDEX_ENABLED: bool = True
+    # Load the spaCy model during the startup warm-up. Workers that never serve
+    # discovery can turn this off; the model still loads on first use.
+    WARMUP_NLP: bool = True
+
+    # /brands/leaderboard serves the top LEADERBOARD_CACHE_SIZE brands from
+    # memory; after a vote the cached list may be this many seconds stale.
+    LEADERBOARD_CACHE_SIZE: int = 200
+    LEADERBOARD_MAX_STALENESS_SECONDS: float = 2.0
+    # Leaderboard variants (country, region, window, ...) kept at once; the
+    # least recently served ones are dropped beyond this.
+    LEADERBOARD_CACHE_MAX_VARIANTS: int = 64
+
+    # Votes go through a per-process single-writer queue and are committed in
+    # micro-batches of up to VOTE_BATCH_MAX_SIZE, waiting at most
+    # VOTE_BATCH_MAX_WAIT_MS for a batch to fill.
+    VOTE_BATCHING_ENABLED: bool = True
+    VOTE_BATCH_MAX_SIZE: int = 64
+    VOTE_BATCH_MAX_WAIT_MS: float = 5.0
+    # Largest payload accepted by POST /matches/batch
+    MATCH_BATCH_MAX_SIZE: int = 500
+
+    # Log every SQL statement (SQLAlchemy echo); noisy and slow, debugging only.
+    SQL_ECHO: bool = False
+    # Dev mode: report per-request query count and DB time in X-DB-* headers.
+    SQL_STATS_HEADERS: bool = False
+    # How many of a request's slowest statements are kept.
+    SQL_STATS_SLOWEST: int = 3
+    # Warn when one request runs the same statement shape this many times.
+    SQL_REPEAT_WARN_THRESHOLD: int = 10
+
     class Config:
         env_file = ".env"
         extra = "ignore"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
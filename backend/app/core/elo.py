@@ -1,19 +1,26 @@
 # app/core/elo.py
 
+# K-factor schedule, shared with the vectorized replay in app/core/replay.py
+PLACEMENT_MATCHES = 15
+PLACEMENT_K = 60
+ELITE_RATING = 1300
+ELITE_K = 16
+STANDARD_K = 32
+
 def get_k_factor(matches_played: int, current_rating: int) -> int:
     """
     Determines the volatility (K-Factor) of a brand based on its maturity and rank.
     """
     # 1. PLACEMENT PHASE: High volatility to find true rank quickly
-    if matches_played < 15:
-        return 60
+    if matches_played < PLACEMENT_MATCHES:
+        return PLACEMENT_K
     
     # 2. ELITE PHASE: Low volatility to stabilize top-tier leaderboards
-    if current_rating >= 1300:
-        return 16
+    if current_rating >= ELITE_RATING:
+        return ELITE_K
         
     # 3. STANDARD PHASE: Normal volatility
-    return 32
+    return STANDARD_K
 
 def calculate_expected_score(rating_a: int, rating_b: int) -> float:
     """
@@ -0,0 +1,194 @@
+from collections import defaultdict
+from typing import Hashable, Iterable, Iterator
+
+import numpy as np
+
+# Character buckets for the multiset bound: a-z, 0-9, anything else but space
+_BUCKETS = 37
+_BUCKET_OF = np.full(0x110000, _BUCKETS - 1, dtype=np.uint8)
+_BUCKET_OF[np.arange(ord("a"), ord("z") + 1)] = np.arange(26)
+_BUCKET_OF[np.arange(ord("0"), ord("9") + 1)] = np.arange(26, 36)
+
+# Per-name string forms WRatio compares: the name itself, its words sorted
+# and single-spaced (token_sort), and its distinct words sorted (token_set).
+# The first two hold the same characters.
+RAW, SORTED, DISTINCT = range(3)
+_CHARS_OF_FORM = (0, 0, 1)
+
+
+def _char_counts(text: str) -> np.ndarray:
+    codes = np.frombuffer(text.replace(" ", "").encode("utf-32-le"), dtype=np.uint32)
+    return np.bincount(_BUCKET_OF[codes], minlength=_BUCKETS).astype(np.uint16)
+
+
+def _forms(processed: str) -> tuple[list[np.ndarray], list[int], list[int]]:
+    """
+    Character counts of the name and of its distinct words, then the length
+    and number of spaces of each form (RAW, SORTED, DISTINCT).
+    """
+    words = processed.split()
+    distinct = " ".join(sorted(set(words)))
+    return (
+        [_char_counts(processed), _char_counts(distinct)],
+        [len(processed), len(" ".join(words)), len(distinct)],
+        [processed.count(" "), max(len(words) - 1, 0), max(len(set(words)) - 1, 0)],
+    )
+
+
+def _ratio_bound(shared: np.ndarray, len1, len2) -> np.ndarray:
+    """Indel ratio is 200 * LCS / (len1 + len2), and LCS <= shared characters."""
+    return 200 * shared / (len1 + len2)
+
+
+def _partial_bound(shared: np.ndarray, len1, len2) -> np.ndarray:
+    """
+    partial_ratio aligns the shorter string (length m) with windows of the
+    other; a window of length w scores at most 200 * min(w, shared) / (m + w),
+    largest at w = shared.
+    """
+    shortest = np.minimum(len1, len2)
+    best = np.minimum(shared, shortest)
+    return 200 * best / (shortest + best)
+
+
+class WRatioBounds:
+    """
+    Upper bounds on rapidfuzz's WRatio between a query and every stored name,
+    computed in a few vectorized steps.
+
+    Every WRatio component is an Indel ratio over the two names, their sorted
+    words, their distinct words, or windows of those, so the characters the
+    two strings share cap it. The one exception is a word in common, which
+    lets token_set_ratio and partial_token_ratio reach 100. The length ratio
+    then picks WRatio's branch and scales (0.95, 0.9, 0.6) as WRatio does.
+
+    A name whose bound is below a score cannot reach it, so callers only
+    need to score the rest.
+    """
+
+    def __init__(self):
+        self._keys: list[Hashable] = []
+        self._names: list[str] = []
+        self._positions: dict[Hashable, int] = {}
+        self._words: dict[str, set[int]] = defaultdict(set)
+        # Indexed [name or distinct words, bucket, slot] and [form, slot]
+        self._counts = np.zeros((2, _BUCKETS, 0), dtype=np.uint16)
+        self._length = np.zeros((3, 0), dtype=np.int32)
+        self._spaces = np.zeros((3, 0), dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def rebuild(self, items: Iterable[tuple[Hashable, str]]) -> None:
+        self.__init__()
+        items = list(items)
+        self._grow(len(items))
+        for key, processed in items:
+            self.add(key, processed)
+
+    def _grow(self, extra: int) -> None:
+        capacity = self._length.shape[1]
+        size = len(self._keys) + extra
+        if size <= capacity:
+            return
+        grow = max(size, 2 * capacity, 64) - capacity
+        self._counts = np.concatenate(
+            (self._counts, np.zeros((2, _BUCKETS, grow), dtype=np.uint16)), axis=2,
+        )
+        self._length = np.concatenate((self._length, np.zeros((3, grow), dtype=np.int32)), axis=1)
+        self._spaces = np.concatenate((self._spaces, np.zeros((3, grow), dtype=np.int32)), axis=1)
+
+    def add(self, key: Hashable, processed: str) -> None:
+        self.remove(key)
+        self._grow(1)
+        position = len(self._keys)
+        self._keys.append(key)
+        self._names.append(processed)
+        self._positions[key] = position
+
+        counts, lengths, spaces = _forms(processed)
+        self._counts[:, :, position] = counts
+        self._length[:, position] = lengths
+        self._spaces[:, position] = spaces
+        for word in set(processed.split()):
+            self._words[word].add(position)
+
+    def remove(self, key: Hashable) -> None:
+        # The slot stays behind with length 0, which bounds to 0
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        for word in set(self._names[position].split()):
+            self._words[word].discard(position)
+            if not self._words[word]:
+                del self._words[word]
+        self._length[:, position] = 0
+
+    def ranked(
+        self, query: str, floor: float, batch_size: int
+    ) -> Iterator[tuple[float, list[Hashable], list[str]]]:
+        """
+        Names whose bound reaches `floor`, highest bound first, in batches of
+        `batch_size` as (highest bound in the batch, keys, names). `query`
+        must be processed the same way as the names.
+        """
+        if not query or not self._positions:
+            return
+        bound = self.upper_bounds(query)
+        positions = np.flatnonzero(bound >= floor)
+        positions = positions[np.argsort(-bound[positions], kind="stable")]
+        for start in range(0, len(positions), batch_size):
+            batch = positions[start:start + batch_size].tolist()
+            yield float(bound[batch[0]]), [self._keys[p] for p in batch], [self._names[p] for p in batch]
+
+    def upper_bounds(self, query: str) -> np.ndarray:
+        """WRatio upper bound per slot, in insertion order (removed slots are 0)."""
+        n = len(self._keys)
+        length = self._length[RAW, :n]
+
+        q_counts, q_lengths, q_spaces = _forms(query)
+        shared_chars = []
+        for chars, counts in enumerate(q_counts):
+            total = np.zeros(n, dtype=np.int32)
+            # Only the query's own characters can be shared
+            for bucket in np.flatnonzero(counts).tolist():
+                total += np.minimum(self._counts[chars, bucket, :n], counts[bucket])
+            shared_chars.append(total)
+        shared = [
+            shared_chars[_CHARS_OF_FORM[form]] + np.minimum(self._spaces[form, :n], q_spaces[form])
+            for form in (RAW, SORTED, DISTINCT)
+        ]
+        lengths = [(self._length[form, :n], q_lengths[form]) for form in (RAW, SORTED, DISTINCT)]
+
+        shares_word = np.zeros(n, dtype=bool)
+        for word in set(query.split()):
+            positions = self._words.get(word)
+            if positions:
+                shares_word[np.fromiter(positions, dtype=np.int64, count=len(positions))] = True
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = _ratio_bound(shared[RAW], *lengths[RAW])
+            token_ratio = np.where(
+                shares_word, 100.0,
+                np.maximum(
+                    _ratio_bound(shared[SORTED], *lengths[SORTED]),
+                    _ratio_bound(shared[DISTINCT], *lengths[DISTINCT]),
+                ),
+            )
+            partial = _partial_bound(shared[RAW], *lengths[RAW])
+            partial_token = np.where(
+                shares_word, 100.0,
+                np.maximum(
+                    _partial_bound(shared[SORTED], *lengths[SORTED]),
+                    _partial_bound(shared[DISTINCT], *lengths[DISTINCT]),
+                ),
+            )
+
+            length_ratio = np.maximum(length, len(query)) / np.minimum(length, len(query))
+            scale = np.where(length_ratio <= 8.0, 0.9, 0.6)
+            bound = np.where(
+                length_ratio < 1.5,
+                np.maximum(ratio, 0.95 * token_ratio),
+                np.maximum.reduce([ratio, scale * partial, 0.95 * scale * partial_token]),
+            )
+        return np.where(length > 0, np.nan_to_num(bound), 0.0)
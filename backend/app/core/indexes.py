@@ -0,0 +1,90 @@
+"""
+Keeps every per-process in-memory index and cache in step with committed writes.
+Services call these after their commit succeeds.
+"""
+import asyncio
+import uuid
+from typing import Iterable
+
+from sqlmodel import Session
+
+from app.core.brand_name_index import brand_name_index
+from app.core.config import settings
+from app.core.leaderboard_cache import leaderboard_cache
+from app.core.matchmaker import matchmaker
+from app.core.pair_sampler import pair_sampler
+from app.core.rank_index import rank_index
+from app.db.session import engine
+
+
+def brand_created(
+    brand_id: uuid.UUID, name: str, elo: int, regions: Iterable[str], logo_url: str | None = None,
+) -> None:
+    rank_index.add(elo)
+    brand_name_index.add(brand_id, name, logo_url)
+    pair_sampler.add(brand_id, regions)
+    matchmaker.add(brand_id, elo)
+    leaderboard_cache.invalidate()
+
+
+def brand_details_changed(brand_id: uuid.UUID, name: str, logo_url: str | None) -> None:
+    brand_name_index.update(brand_id, name, logo_url)
+    leaderboard_cache.invalidate()
+
+
+def brand_regions_changed(brand_id: uuid.UUID, regions: Iterable[str]) -> None:
+    pair_sampler.set_regions(brand_id, regions)
+    leaderboard_cache.invalidate()
+
+
+def brand_deleted(brand_id: uuid.UUID, elo: int) -> None:
+    rank_index.remove(elo)
+    brand_name_index.remove(brand_id)
+    pair_sampler.remove(brand_id)
+    matchmaker.remove(brand_id)
+    leaderboard_cache.invalidate()
+
+
+def match_recorded(
+    winner_id: uuid.UUID, winner_elo_before: int, winner_elo_after: int,
+    loser_id: uuid.UUID, loser_elo_before: int, loser_elo_after: int,
+) -> None:
+    rank_index.move(winner_elo_before, winner_elo_after)
+    rank_index.move(loser_elo_before, loser_elo_after)
+    matchmaker.record_match(winner_id, winner_elo_after, loser_id, loser_elo_after)
+    leaderboard_cache.invalidate()
+
+
+def warm_indexes(session: Session) -> None:
+    if settings.RANK_INDEX_ENABLED:
+        rank_index.ensure_fresh(session)
+    brand_name_index.ensure_fresh(session)
+    pair_sampler.ensure_fresh(session)
+    matchmaker.ensure_fresh(session)
+    if not matchmaker.met_pairs_loaded:
+        matchmaker.load_met_pairs(session)
+
+
+def _warm_in_new_session() -> None:
+    with Session(engine) as session:
+        warm_indexes(session)
+
+
+async def ensure_ready() -> None:
+    """
+    Loads any cold index on a worker thread. The async services await this
+    before run_sync, which would otherwise load it on the event-loop thread.
+    """
+    if not all(index_readiness().values()):
+        await asyncio.to_thread(_warm_in_new_session)
+
+
+def index_readiness() -> dict[str, bool]:
+    components = {
+        "brand_name_index": brand_name_index.is_ready,
+        "pair_sampler": pair_sampler.is_ready,
+        "matchmaker": matchmaker.is_ready,
+    }
+    if settings.RANK_INDEX_ENABLED:
+        components["rank_index"] = rank_index.is_ready
+    return components
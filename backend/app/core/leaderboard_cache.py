@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Hashable
+
+from app.core.config import settings
+from app.schemas.brand import BrandRead
+
+
+@dataclass
+class _Snapshot:
+    brands: list[BrandRead]
+    built_at: float = field(default_factory=time.monotonic)
+    dirty: bool = False
+
+
+class LeaderboardCache:
+    """
+    Ready-to-serialize snapshots of the top LEADERBOARD_CACHE_SIZE brands,
+    one per leaderboard variant (country filter, ordering, ...).
+
+    Committed votes and brand edits mark every snapshot dirty. A dirty
+    snapshot keeps being served until it is LEADERBOARD_MAX_STALENESS_SECONDS
+    old, so under a high vote rate the top list is rebuilt at most that
+    often rather than once per vote. Snapshots older than
+    INDEX_RESYNC_SECONDS are rebuilt regardless, to pick up other workers.
+
+    The lock only guards the dict, never a load: with ASYNC_DB the load runs
+    on the event-loop thread and must not wait on another request. While one
+    caller rebuilds a variant, the others keep serving its previous snapshot.
+    At most LEADERBOARD_CACHE_MAX_VARIANTS variants are kept, least recently
+    served first out, since country and region come straight from the query
+    string.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: OrderedDict[Hashable, _Snapshot] = OrderedDict()
+        self._refreshing: set[Hashable] = set()
+        self._generation = 0
+
+    def _is_usable(self, snapshot: _Snapshot | None) -> bool:
+        if snapshot is None:
+            return False
+        age = time.monotonic() - snapshot.built_at
+        if age >= settings.INDEX_RESYNC_SECONDS:
+            return False
+        return not snapshot.dirty or age < settings.LEADERBOARD_MAX_STALENESS_SECONDS
+
+    def get(
+        self,
+        key: Hashable,
+        offset: int,
+        limit: int,
+        load: Callable[[int], list[BrandRead]],
+    ) -> list[BrandRead] | None:
+        """
+        Returns the requested slice from the snapshot for `key`, rebuilding it
+        with `load(size)` when needed. Returns None for pages past the cached
+        top N, which the caller should read from the database.
+        """
+        if offset + limit > settings.LEADERBOARD_CACHE_SIZE:
+            return None
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                self._snapshots.move_to_end(key)
+            refresh = not self._is_usable(snapshot) and key not in self._refreshing
+            if refresh:
+                self._refreshing.add(key)
+            generation = self._generation
+
+        if refresh or snapshot is None:
+            try:
+                brands = load(settings.LEADERBOARD_CACHE_SIZE)
+            finally:
+                if refresh:
+                    with self._lock:
+                        self._refreshing.discard(key)
+            snapshot = _Snapshot(brands)
+            with self._lock:
+                # A write committed during the load may be missing from it
+                snapshot.dirty = self._generation != generation
+                self._snapshots[key] = snapshot
+                self._snapshots.move_to_end(key)
+                while len(self._snapshots) > settings.LEADERBOARD_CACHE_MAX_VARIANTS:
+                    self._snapshots.popitem(last=False)
+
+        return snapshot.brands[offset:offset + limit]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            for snapshot in self._snapshots.values():
+                snapshot.dirty = True
+
+
+leaderboard_cache = LeaderboardCache()
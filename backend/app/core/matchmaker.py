@@ -0,0 +1,252 @@
+import math
+import random
+import uuid
+from bisect import bisect_left, insort
+from typing import Callable
+
+from sqlmodel import Session, select
+
+from app.core.elo import calculate_expected_score, get_k_factor
+from app.core.memory_index import MemoryIndex
+from app.models.brand import Brand
+from app.models.head_to_head import HeadToHead
+
+# Opponents considered on each side of the first brand, in Elo order
+CANDIDATE_WINDOW = 12
+# How far the window may widen when a country filter rejects neighbours
+MAX_SCAN = CANDIDATE_WINDOW * 8
+# Score multiplier for a pair that has never been matched before
+NOVELTY_BONUS = 2.0
+# First-brand draws attempted before giving up on a country filter
+MAX_DRAWS = 20
+
+
+def _pair_key(a: uuid.UUID, b: uuid.UUID) -> tuple[int, int]:
+    return (a.int, b.int) if a.int < b.int else (b.int, a.int)
+
+
+def _uncertainty(matches_played: int, elo: int) -> float:
+    """Higher for brands whose rating is still moving (placement-phase K, few matches)."""
+    return get_k_factor(matches_played, elo) / math.sqrt(1 + matches_played)
+
+
+class _WeightTree:
+    """Fenwick tree of float weights supporting O(log n) updates and weighted draws."""
+
+    def __init__(self):
+        self._tree: list[float] = [0.0]
+        self._weights: list[float] = []
+
+    def _prefix(self, i: int) -> float:
+        total = 0.0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def append(self, weight: float) -> int:
+        self._weights.append(weight)
+        i = len(self._weights)
+        self._tree.append(weight + self._prefix(i - 1) - self._prefix(i - (i & -i)))
+        return i - 1
+
+    def set(self, slot: int, weight: float) -> None:
+        delta = weight - self._weights[slot]
+        self._weights[slot] = weight
+        i = slot + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def total(self) -> float:
+        return self._prefix(len(self._weights))
+
+    def find(self, target: float) -> int:
+        """Slot whose cumulative weight range contains `target`."""
+        pos = 0
+        step = 1 << (len(self._weights).bit_length())
+        while step:
+            nxt = pos + step
+            if nxt < len(self._tree) and self._tree[nxt] <= target:
+                pos = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return min(pos, len(self._weights) - 1)
+
+
+class Matchmaker(MemoryIndex):
+    """
+    Picks informative vote pairs instead of uniformly random ones.
+
+    The first brand is drawn in proportion to its rating uncertainty (K-factor
+    over sqrt of matches played), from a weight tree. The opponent is drawn
+    from its Elo neighbours, scored by p * (1 - p) of the expected result,
+    the neighbour's own uncertainty, and a bonus when the two have never met.
+    All of it is in memory, so a pick costs a few dozen operations.
+
+    The periodic resync only reloads the brands. The set of pairs that have
+    met is read in full once, by load_met_pairs from the warm-up thread, and
+    from then on grows with every match this worker records. Until it is
+    loaded, every pair counts as new.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._rng = random.Random()
+        self._weights = _WeightTree()
+        self._slot_of: dict[uuid.UUID, int] = {}
+        self._id_at: list[uuid.UUID | None] = []
+        self._free_slots: list[int] = []
+        self._elo: dict[uuid.UUID, int] = {}
+        self._matches: dict[uuid.UUID, int] = {}
+        self._order: list[tuple[int, uuid.UUID]] = []
+        self._met: set[tuple[int, int]] = set()
+        self._met_loaded = False
+
+    @property
+    def met_pairs_loaded(self) -> bool:
+        return self._met_loaded
+
+    def load_met_pairs(self, session: Session) -> None:
+        """Reads every pair that has met. A full head_to_head scan: keep it off the request path."""
+        met = {
+            _pair_key(low_id, high_id)
+            for low_id, high_id in session.exec(
+                select(HeadToHead.brand_low_id, HeadToHead.brand_high_id)
+            ).all()
+        }
+        with self._lock:
+            # Keeps the pairs recorded while the query ran
+            self._met.update(met)
+            self._met_loaded = True
+
+    def _fetch(self, session: Session) -> list:
+        return session.exec(select(Brand.id, Brand.elo, Brand.wins, Brand.losses, Brand.ties)).all()
+
+    def _install(self, rows: list) -> None:
+        self._weights = _WeightTree()
+        self._slot_of = {}
+        self._id_at = []
+        self._free_slots = []
+        self._elo = {}
+        self._matches = {}
+        self._order = []
+
+        for brand_id, elo, wins, losses, ties in rows:
+            self._insert(brand_id, elo, wins + losses + ties, keep_sorted=False)
+        self._order.sort()
+
+    def _insert(self, brand_id: uuid.UUID, elo: int, matches_played: int, keep_sorted: bool = True) -> None:
+        if brand_id in self._slot_of:
+            return
+        weight = _uncertainty(matches_played, elo)
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._weights.set(slot, weight)
+            self._id_at[slot] = brand_id
+        else:
+            slot = self._weights.append(weight)
+            self._id_at.append(brand_id)
+        self._slot_of[brand_id] = slot
+        self._elo[brand_id] = elo
+        self._matches[brand_id] = matches_played
+        if keep_sorted:
+            insort(self._order, (elo, brand_id))
+        else:
+            self._order.append((elo, brand_id))
+
+    def _delete(self, brand_id: uuid.UUID) -> None:
+        slot = self._slot_of.pop(brand_id, None)
+        if slot is None:
+            return
+        self._weights.set(slot, 0.0)
+        self._id_at[slot] = None
+        self._free_slots.append(slot)
+        elo = self._elo.pop(brand_id)
+        self._matches.pop(brand_id)
+        index = bisect_left(self._order, (elo, brand_id))
+        if index < len(self._order) and self._order[index] == (elo, brand_id):
+            del self._order[index]
+
+    def _apply_result(self, brand_id: uuid.UUID, new_elo: int) -> None:
+        if brand_id not in self._slot_of:
+            return
+        old_elo = self._elo[brand_id]
+        index = bisect_left(self._order, (old_elo, brand_id))
+        if index < len(self._order) and self._order[index] == (old_elo, brand_id):
+            del self._order[index]
+        insort(self._order, (new_elo, brand_id))
+        self._elo[brand_id] = new_elo
+        self._matches[brand_id] += 1
+        self._weights.set(self._slot_of[brand_id], _uncertainty(self._matches[brand_id], new_elo))
+
+    def add(self, brand_id: uuid.UUID, elo: int) -> None:
+        with self._lock:
+            if self.is_ready:
+                self._insert(brand_id, elo, 0)
+
+    def remove(self, brand_id: uuid.UUID) -> None:
+        with self._lock:
+            if self.is_ready:
+                self._delete(brand_id)
+
+    def record_match(self, brand_a: uuid.UUID, new_elo_a: int, brand_b: uuid.UUID, new_elo_b: int) -> None:
+        with self._lock:
+            if self.is_ready:
+                self._apply_result(brand_a, new_elo_a)
+                self._apply_result(brand_b, new_elo_b)
+            self._met.add(_pair_key(brand_a, brand_b))
+
+    def choose_pair(
+        self, eligible: Callable[[uuid.UUID], bool] | None = None
+    ) -> tuple[uuid.UUID, uuid.UUID] | None:
+        """
+        Returns an informative pair in random left/right order, restricted to
+        brands for which `eligible` is true when given. None if no pair found.
+        """
+        with self._lock:
+            for _ in range(MAX_DRAWS):
+                total = self._weights.total()
+                if total <= 0 or len(self._order) < 2:
+                    return None
+
+                first = self._id_at[self._weights.find(self._rng.random() * total)]
+                if first is None or (eligible and not eligible(first)):
+                    continue
+
+                opponent = self._pick_opponent(first, eligible)
+                if opponent is None:
+                    continue
+                return (first, opponent) if self._rng.random() < 0.5 else (opponent, first)
+        return None
+
+    def _pick_opponent(
+        self, first: uuid.UUID, eligible: Callable[[uuid.UUID], bool] | None
+    ) -> uuid.UUID | None:
+        first_elo = self._elo[first]
+        center = bisect_left(self._order, (first_elo, first))
+
+        candidates: list[uuid.UUID] = []
+        scores: list[float] = []
+        for distance in range(1, MAX_SCAN + 1):
+            for index in (center - distance, center + distance):
+                if not 0 <= index < len(self._order):
+                    continue
+                elo, brand_id = self._order[index]
+                if eligible and not eligible(brand_id):
+                    continue
+                p = calculate_expected_score(first_elo, elo)
+                score = p * (1 - p) * _uncertainty(self._matches[brand_id], elo)
+                if _pair_key(first, brand_id) not in self._met:
+                    score *= NOVELTY_BONUS
+                candidates.append(brand_id)
+                scores.append(score)
+            if len(candidates) >= 2 * CANDIDATE_WINDOW:
+                break
+
+        if not candidates:
+            return None
+        return self._rng.choices(candidates, weights=scores)[0]
+
+
+matchmaker = Matchmaker()
@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+from typing import Any
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryIndex:
+    """
+    Base class for in-memory views over database tables.
+
+    Each worker process keeps its own copy. Services patch it after their own
+    commits, and a full reload happens once the copy is older than
+    INDEX_RESYNC_SECONDS so writes from other workers and scripts show up.
+
+    A reload reads the rows without holding the index lock and only takes it
+    to install them, so lookups never wait on the database. With ASYNC_DB the
+    services run on the event-loop thread: there a stale index keeps serving
+    while a background thread reloads it, and cold indexes are loaded on a
+    worker thread before the request starts (see indexes.ensure_ready).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._built_at: float | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._built_at is not None
+
+    def _fetch(self, session: Session) -> Any:
+        """Reads everything the index is built from. Runs without the lock."""
+        raise NotImplementedError
+
+    def _install(self, rows: Any) -> None:
+        """Replaces the index contents with `rows`. Runs under the lock."""
+        raise NotImplementedError
+
+    def rebuild(self, session: Session) -> None:
+        rows = self._fetch(session)
+        with self._lock:
+            self._install(rows)
+            self._built_at = time.monotonic()
+
+    def ensure_fresh(self, session: Session) -> None:
+        if self._is_fresh():
+            return
+        if settings.ASYNC_DB and self.is_ready:
+            self._refresh_in_background()
+            return
+        # One reload at a time; the callers queued behind it find it fresh
+        with self._refresh_lock:
+            if not self._is_fresh():
+                self.rebuild(session)
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name=f"{type(self).__name__}-refresh", daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            with self._refresh_lock, Session(engine) as session:
+                if not self._is_fresh():
+                    self.rebuild(session)
+        except Exception:
+            logger.exception("Background reload of %s failed", type(self).__name__)
+        finally:
+            self._refreshing = False
+
+    def invalidate(self) -> None:
+        self._built_at = None
+
+    def _is_fresh(self) -> bool:
+        built_at = self._built_at
+        return built_at is not None and time.monotonic() - built_at < settings.INDEX_RESYNC_SECONDS
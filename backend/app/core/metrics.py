@@ -0,0 +1,105 @@
+"""
+Prometheus metrics.
+
+Under several uvicorn workers set PROMETHEUS_MULTIPROC_DIR (an empty,
+writable directory, wiped before each start) in the environment: every worker
+then writes its samples to files there and /metrics aggregates all of them,
+whichever worker answers the scrape. Without it, /metrics only reports the
+worker that served it.
+"""
+import functools
+import os
+import time
+
+from fastapi import Request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+from app.core.sql_stats import current_stats
+
+# Sub-millisecond to multi-second, for both in-memory paths and DB round trips
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "teaelo_http_request_duration_seconds", "HTTP request latency",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+DB_REQUEST_SECONDS = Histogram(
+    "teaelo_db_time_per_request_seconds", "Total SQL time spent serving a request",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "teaelo_db_queries_per_request", "SQL statements issued while serving a request",
+    ["method", "route"], buckets=SIZE_BUCKETS,
+)
+OPERATION_SECONDS = Histogram(
+    "teaelo_operation_duration_seconds", "Time spent in service and domain hot paths",
+    ["operation"], buckets=LATENCY_BUCKETS,
+)
+VOTES_RECORDED = Counter("teaelo_votes_recorded_total", "Votes committed", ["outcome"])
+VOTE_BATCH_SIZE = Histogram(
+    "teaelo_vote_batch_size", "Votes committed per vote-writer transaction", buckets=SIZE_BUCKETS,
+)
+DISCOVERY_BATCH_SIZE = Histogram(
+    "teaelo_discovery_batch_size", "Places per discovery request", buckets=SIZE_BUCKETS,
+)
+
+
+def timed(operation: str):
+    """Decorator recording the call's duration under OPERATION_SECONDS{operation=...}."""
+    histogram = OPERATION_SECONDS.labels(operation)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def _route_label(request: Request) -> str:
+    # The route template, not the raw path, keeps label cardinality bounded
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+async def metrics_middleware(request: Request, call_next):
+    """Must sit inside sql_stats_middleware so the request's SQL stats are visible."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = _route_label(request)
+        HTTP_REQUEST_SECONDS.labels(request.method, route, str(status)).observe(
+            time.perf_counter() - started
+        )
+        stats = current_stats()
+        if stats is not None:
+            DB_REQUEST_SECONDS.labels(request.method, route).observe(stats.total_seconds)
+            DB_QUERIES_PER_REQUEST.labels(request.method, route).observe(stats.query_count)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drops this worker's live-only samples from the shared directory on shutdown."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,145 @@
+import random
+import uuid
+from collections import defaultdict
+from typing import Iterable
+
+from sqlmodel import Session, select
+
+from app.core.memory_index import MemoryIndex
+from app.models.brand import Brand
+from app.models.brand_region import BrandRegion, GLOBAL_REGION
+
+
+class _Pool:
+    """Array of brand ids with O(1) add, remove (swap with last) and sampling."""
+
+    def __init__(self, ids: Iterable[uuid.UUID] = ()):
+        self.ids: list[uuid.UUID] = []
+        self.positions: dict[uuid.UUID, int] = {}
+        for brand_id in ids:
+            self.add(brand_id)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, brand_id: uuid.UUID) -> None:
+        if brand_id not in self.positions:
+            self.positions[brand_id] = len(self.ids)
+            self.ids.append(brand_id)
+
+    def remove(self, brand_id: uuid.UUID) -> None:
+        index = self.positions.pop(brand_id, None)
+        if index is None:
+            return
+        last = self.ids.pop()
+        if index < len(self.ids):
+            self.ids[index] = last
+            self.positions[last] = index
+
+    def sample_two(self, rng: random.Random) -> tuple[uuid.UUID, uuid.UUID] | None:
+        n = len(self.ids)
+        if n < 2:
+            return None
+        i = rng.randrange(n)
+        j = rng.randrange(n - 1)
+        if j >= i:
+            j += 1
+        return self.ids[i], self.ids[j]
+
+
+class PairSampler(MemoryIndex):
+    """
+    Draws two distinct random brands in constant time for the voting screen.
+
+    Keeps one pool of every brand plus, per country, a pool of the brands
+    present there or tagged "Global", so a country-filtered draw never sorts
+    or scans the brands table.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._rng = random.Random()
+        self._regions: dict[uuid.UUID, frozenset[str]] = {}
+        self._all = _Pool()
+        self._global = _Pool()
+        self._by_country: dict[str, _Pool] = {}
+
+    def _fetch(self, session: Session) -> dict[uuid.UUID, list[str]]:
+        regions: dict[uuid.UUID, list[str]] = defaultdict(list)
+        for brand_id, region in session.exec(select(BrandRegion.brand_id, BrandRegion.region)).all():
+            regions[brand_id].append(region)
+        return {brand_id: regions.get(brand_id, []) for brand_id in session.exec(select(Brand.id)).all()}
+
+    def _install(self, regions: dict[uuid.UUID, list[str]]) -> None:
+        self._regions = {}
+        self._all = _Pool()
+        self._global = _Pool()
+        self._by_country = {}
+        for brand_id, brand_regions in regions.items():
+            self._insert(brand_id, brand_regions)
+
+    def _insert(self, brand_id: uuid.UUID, regions: Iterable[str]) -> None:
+        regions = frozenset(regions)
+        self._regions[brand_id] = regions
+        self._all.add(brand_id)
+
+        if GLOBAL_REGION in regions:
+            self._global.add(brand_id)
+            for pool in self._by_country.values():
+                pool.add(brand_id)
+
+        for country in regions - {GLOBAL_REGION}:
+            if country not in self._by_country:
+                self._by_country[country] = _Pool(self._global.ids)
+            self._by_country[country].add(brand_id)
+
+    def _delete(self, brand_id: uuid.UUID) -> None:
+        regions = self._regions.pop(brand_id, None)
+        if regions is None:
+            return
+        self._all.remove(brand_id)
+
+        if GLOBAL_REGION in regions:
+            self._global.remove(brand_id)
+            pools = self._by_country.values()
+        else:
+            pools = [self._by_country[c] for c in regions if c in self._by_country]
+        for pool in pools:
+            pool.remove(brand_id)
+
+    def add(self, brand_id: uuid.UUID, regions: Iterable[str]) -> None:
+        with self._lock:
+            if self.is_ready:
+                self._insert(brand_id, regions or [])
+
+    def set_regions(self, brand_id: uuid.UUID, regions: Iterable[str]) -> None:
+        with self._lock:
+            if self.is_ready:
+                self._delete(brand_id)
+                self._insert(brand_id, regions or [])
+
+    def remove(self, brand_id: uuid.UUID) -> None:
+        with self._lock:
+            if self.is_ready:
+                self._delete(brand_id)
+
+    def in_pool(self, brand_id: uuid.UUID, country_code: str) -> bool:
+        """True if the brand is eligible for `country_code` pairs."""
+        with self._lock:
+            pool = self._by_country.get(country_code, self._global)
+            return brand_id in pool.positions
+
+    def sample_pair(self, country_code: str | None = None) -> tuple[uuid.UUID, uuid.UUID] | None:
+        """
+        Returns two distinct brand ids, restricted to brands present in
+        `country_code` (or "Global") when given. None if fewer than two qualify.
+        """
+        with self._lock:
+            if country_code is None:
+                pool = self._all
+            else:
+                pool = self._by_country.get(country_code, self._global)
+            return pool.sample_two(self._rng)
+
+
+pair_sampler = PairSampler()
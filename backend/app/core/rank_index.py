@@ -0,0 +1,108 @@
+from collections import Counter
+
+from sqlmodel import Session, select
+
+from app.core.memory_index import MemoryIndex
+from app.models.brand import Brand
+
+# Headroom kept on each side of the observed Elo range so ordinary rating
+# movement never forces the tree to be resized.
+ELO_PADDING = 500
+
+
+class RankIndex(MemoryIndex):
+    """
+    Order-statistic index over brand Elo ratings.
+
+    A Fenwick tree over the integer Elo domain answers "how many brands are
+    rated above x" in O(log n), which gives the same rank as
+    `COUNT(*) WHERE elo > x` + 1 without touching the database.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._counts: Counter[int] = Counter()
+        self._low = 0
+        self._high = -1
+        self._tree: list[int] = [0]
+        self._total = 0
+
+    def _fetch(self, session: Session) -> Counter[int]:
+        return Counter(session.exec(select(Brand.elo)).all())
+
+    def _install(self, counts: Counter[int]) -> None:
+        self._reset(counts)
+
+    def _reset(self, counts: Counter[int]) -> None:
+        self._counts = +counts
+        if self._counts:
+            self._low = min(self._counts) - ELO_PADDING
+            self._high = max(self._counts) + ELO_PADDING
+        else:
+            self._low = 1200 - ELO_PADDING
+            self._high = 1200 + ELO_PADDING
+
+        size = self._high - self._low + 1
+        tree = [0] * (size + 1)
+        for elo, count in self._counts.items():
+            tree[elo - self._low + 1] += count
+        # Linear-time Fenwick construction: push each node into its parent.
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._total = sum(self._counts.values())
+
+    def _update(self, elo: int, delta: int) -> None:
+        if elo < self._low or elo > self._high:
+            counts = Counter(self._counts)
+            counts[elo] += delta
+            self._reset(counts)
+            return
+
+        self._counts[elo] += delta
+        self._total += delta
+        i = elo - self._low + 1
+        size = len(self._tree) - 1
+        while i <= size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_at_or_below(self, elo: int) -> int:
+        if elo < self._low:
+            return 0
+        if elo >= self._high:
+            return self._total
+        i = elo - self._low + 1
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def rank(self, elo: int) -> int:
+        """Global rank of a rating: 1 + number of brands rated strictly higher."""
+        with self._lock:
+            return self._total - self._count_at_or_below(elo) + 1
+
+    def add(self, elo: int) -> None:
+        with self._lock:
+            if self.is_ready:
+                self._update(elo, 1)
+
+    def remove(self, elo: int) -> None:
+        with self._lock:
+            if self.is_ready and self._counts[elo] > 0:
+                self._update(elo, -1)
+
+    def move(self, old_elo: int, new_elo: int) -> None:
+        if old_elo == new_elo:
+            return
+        with self._lock:
+            if self.is_ready and self._counts[old_elo] > 0:
+                self._update(old_elo, -1)
+                self._update(new_elo, 1)
+
+
+rank_index = RankIndex()
@@ -0,0 +1,121 @@
+"""
+Per-request SQL accounting.
+
+Cursor-execute hooks on the engines add every statement to the stats of the
+request being served (held in a contextvar), and `sql_stats_middleware`
+reports them: a warning when one request repeats the same statement shape,
+and X-DB-* response headers when SQL_STATS_HEADERS is on.
+"""
+import heapq
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+SLOWEST_QUERY_HEADER = "X-DB-Slowest-Ms"
+
+_PARAM = re.compile(r"%\(\w+\)s|\$\d+|\?")
+_PARAM_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with parameters and expanded IN lists collapsed."""
+    shape = _PARAM.sub("?", statement)
+    shape = _PARAM_LIST.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class SqlStats:
+    query_count: int = 0
+    total_seconds: float = 0.0
+    # Min-heap of (seconds, statement) holding the slowest few
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.total_seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+        entry = (seconds, statement)
+        if len(self.slowest) < settings.SQL_STATS_SLOWEST:
+            heapq.heappush(self.slowest, entry)
+        elif self.slowest and entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+_current: ContextVar[SqlStats | None] = ContextVar("sql_stats", default=None)
+
+
+def current_stats() -> SqlStats | None:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_stats_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("sql_stats_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def instrument(engine: Engine) -> None:
+    """Attach the hooks to a sync engine (or an AsyncEngine's `sync_engine`)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def sql_stats_middleware(request: Request, call_next):
+    stats = SqlStats()
+    token = _current.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+
+    route = request.scope.get("route")
+    endpoint = getattr(route, "path", request.url.path)
+    for shape, count in stats.repeated_shapes(settings.SQL_REPEAT_WARN_THRESHOLD):
+        logger.warning(
+            "Repeated SQL statement: %s %s ran the same statement %d times (possible N+1): %s",
+            request.method, endpoint, count, shape,
+            extra={
+                "method": request.method,
+                "endpoint": endpoint,
+                "repeat_count": count,
+                "statement_shape": shape,
+                "query_count": stats.query_count,
+            },
+        )
+
+    if settings.SQL_STATS_HEADERS:
+        response.headers[QUERY_COUNT_HEADER] = str(stats.query_count)
+        response.headers[QUERY_TIME_HEADER] = f"{stats.total_seconds * 1000:.2f}"
+        if stats.slowest:
+            response.headers[SLOWEST_QUERY_HEADER] = ", ".join(
+                f"{seconds * 1000:.2f}" for seconds, _ in sorted(stats.slowest, reverse=True)
+            )
+    return response
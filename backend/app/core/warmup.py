@@ -0,0 +1,38 @@
+import logging
+import threading
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.indexes import index_readiness, warm_indexes
+from app.db.session import engine
+from app.utils.text import get_nlp, is_nlp_loaded
+
+logger = logging.getLogger(__name__)
+
+_warmup_done = threading.Event()
+
+
+def warm_up() -> None:
+    """
+    Loads heavy per-process resources ahead of first use. Everything here is
+    also loaded lazily on demand, so the API serves requests while this runs.
+    """
+    try:
+        with Session(engine) as session:
+            warm_indexes(session)
+
+        if settings.WARMUP_NLP:
+            get_nlp()
+    except Exception:
+        logger.exception("Warm-up failed; resources will load on first use")
+    finally:
+        _warmup_done.set()
+
+
+def readiness() -> dict[str, bool]:
+    components = index_readiness()
+    components["warmup"] = _warmup_done.is_set()
+    if settings.WARMUP_NLP:
+        components["nlp"] = is_nlp_loaded()
+    return components
@@ -1,2 +1,5 @@
 from sqlmodel import SQLModel
-from app.models import Brand, Match, StoreLocation
\ No newline at end of file
+from app.models import (
+    Brand, BrandActivityDaily, BrandActivityHourly, BrandRegion, HeadToHead, Match,
+    RatingSnapshot, RegionalRating, StoreLocation,
+)
@@ -1,10 +1,9 @@
 from contextlib import contextmanager
 
-from sqlmodel import Session, create_engine
+from sqlmodel import Session
 
-from app.core.config import settings
-
-engine = create_engine(settings.DATABASE_URL, echo=True, pool_pre_ping=True)
+# Scripts share the app's engine (and its SQL_ECHO setting and instrumentation)
+from app.db.session import engine
 
 
 @contextmanager
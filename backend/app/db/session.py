@@ -1,8 +1,34 @@
 from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
 from app.core.config import settings
+from app.core.sql_stats import instrument
 
-engine = create_engine(settings.DATABASE_URL, echo=True, pool_pre_ping=True)
+engine = create_engine(settings.DATABASE_URL, echo=settings.SQL_ECHO, pool_pre_ping=True)
+instrument(engine)
 
 def get_session():
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+def _async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    # Same database through the asyncpg driver
+    scheme, rest = settings.DATABASE_URL.split("://", 1)
+    return f"{scheme.split('+')[0]}+asyncpg://{rest}"
+
+# Only created in async mode so sync-only deployments don't need asyncpg
+async_engine = (
+    create_async_engine(
+        _async_database_url(), echo=settings.SQL_ECHO, pool_pre_ping=True,
+        pool_size=settings.ASYNC_POOL_SIZE,
+    )
+    if settings.ASYNC_DB else None
+)
+if async_engine is not None:
+    instrument(async_engine.sync_engine)
+
+async def get_async_session():
+    async with AsyncSession(async_engine) as session:
+        yield session
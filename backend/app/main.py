@@ -1,9 +1,31 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import brands, matches, discovery
+from app.core.config import settings
+from app.core.metrics import mark_process_dead, metrics_middleware
+from app.core.sql_stats import (
+    QUERY_COUNT_HEADER, QUERY_TIME_HEADER, SLOWEST_QUERY_HEADER, sql_stats_middleware,
+)
+from app.core.warmup import warm_up
+from app.routers import brands, matches, discovery, health, metrics
+from app.services.pagination import NEXT_CURSOR_HEADER
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so the worker starts serving immediately;
+    # /health/ready reports when everything is loaded.
+    warmup_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    yield
+    if not warmup_task.done():
+        warmup_task.cancel()
+    mark_process_dead()
 
-app = FastAPI(title="Teaelo API")
+
+app = FastAPI(title="Teaelo API", lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -18,8 +40,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, QUERY_COUNT_HEADER, QUERY_TIME_HEADER, SLOWEST_QUERY_HEADER],
 )
+# Last added runs outermost: SQL stats wrap the metrics middleware that reads them
+app.middleware("http")(metrics_middleware)
+app.middleware("http")(sql_stats_middleware)
+
+if settings.ASYNC_DB:
+    # Registered first so their routes win over the sync versions
+    from app.routers import async_brands, async_matches, async_discovery
+
+    app.include_router(async_brands.router, prefix="/brands", tags=["Brands"])
+    app.include_router(async_matches.router, prefix="/matches", tags=["Matches"])
+    app.include_router(async_discovery.router, prefix="/discovery", tags=["Discovery"])
 
 app.include_router(brands.router, prefix="/brands", tags=["Brands"])
 app.include_router(matches.router, prefix="/matches", tags=["Matches"])
-app.include_router(discovery.router, prefix="/discovery", tags=["Discovery"])
\ No newline at end of file
+app.include_router(discovery.router, prefix="/discovery", tags=["Discovery"])
+app.include_router(health.router, prefix="/health", tags=["Health"])
+app.include_router(metrics.router, tags=["Metrics"])
@@ -1,3 +1,8 @@
 from .brand import Brand
+from .brand_activity import BrandActivityDaily, BrandActivityHourly
+from .brand_region import BrandRegion
+from .head_to_head import HeadToHead
 from .match import Match
-from .store import StoreLocation
\ No newline at end of file
+from .rating_snapshot import RatingSnapshot
+from .regional_rating import RegionalRating
+from .store import StoreLocation
@@ -2,10 +2,16 @@ import uuid
 from datetime import date
 from typing import List, Optional
 from sqlmodel import Field, SQLModel, JSON
-from sqlalchemy import Column
+from sqlalchemy import Column, Index, text
 
 class Brand(SQLModel, table=True):
     __tablename__ = "brands"
+    __table_args__ = (
+        # Keyset pagination: each cursor page seeks on the list's full sort key
+        Index("ix_brands_name_id", "name", "id"),
+        Index("ix_brands_elo_desc_id", text("elo DESC"), "id"),
+        Index("ix_brands_bt_rating_desc_id", text("bt_rating DESC NULLS LAST"), "id"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)    
     name: str
     description: str | None = None
@@ -21,4 +27,6 @@ class Brand(SQLModel, table=True):
     losses: int = 0
     ties: int = 0
     elo_trend: float = 0.0
-    rank_trend: int = 0
\ No newline at end of file
+    rank_trend: int = 0
+    # Batch Bradley-Terry fit on the Elo scale (scripts/rebuild_ratings.py --engine bt)
+    bt_rating: float | None = Field(default=None, index=True)
\ No newline at end of file
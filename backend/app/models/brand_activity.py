@@ -0,0 +1,19 @@
+import uuid
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+class BrandActivityBase(SQLModel):
+    """A brand's results and net Elo change within one time bucket."""
+    bucket: datetime = Field(primary_key=True)
+    brand_id: uuid.UUID = Field(foreign_key="brands.id", primary_key=True, ondelete="CASCADE", index=True)
+    wins: int = 0
+    losses: int = 0
+    ties: int = 0
+    elo_change: int = 0
+
+class BrandActivityHourly(BrandActivityBase, table=True):
+    """Written by every vote; hours of older days are folded into the daily table."""
+    __tablename__ = "brand_activity_hourly"
+
+class BrandActivityDaily(BrandActivityBase, table=True):
+    __tablename__ = "brand_activity_daily"
@@ -0,0 +1,13 @@
+import uuid
+from sqlmodel import Field, SQLModel
+from sqlalchemy import Index
+
+# Brands tagged with this region are present in every country
+GLOBAL_REGION = "Global"
+
+class BrandRegion(SQLModel, table=True):
+    """One row per (brand, region) so region filters can use an index."""
+    __tablename__ = "brand_regions"
+    __table_args__ = (Index("ix_brand_regions_region_brand_id", "region", "brand_id"),)
+    brand_id: uuid.UUID = Field(foreign_key="brands.id", primary_key=True, ondelete="CASCADE")
+    region: str = Field(primary_key=True)
@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Index, text
+from sqlmodel import Field, SQLModel
+
+# Rivals order: most games, then most recently played
+_RIVAL_ORDER = (text("(low_wins + high_wins + ties) DESC"), text("last_played_at DESC NULLS LAST"))
+
+class HeadToHead(SQLModel, table=True):
+    """
+    Running results between two brands, one row per pair that has met.
+    The pair is stored ordered (brand_low_id < brand_high_id) so each pair
+    has exactly one row; wins are counted per side.
+    """
+    __tablename__ = "head_to_head"
+    __table_args__ = (
+        # One per side of a pair, so a brand's top rivals are two short index scans
+        Index("ix_head_to_head_low_rivals", "brand_low_id", *_RIVAL_ORDER),
+        Index("ix_head_to_head_high_rivals", "brand_high_id", *_RIVAL_ORDER),
+    )
+    brand_low_id: uuid.UUID = Field(foreign_key="brands.id", primary_key=True, ondelete="CASCADE")
+    brand_high_id: uuid.UUID = Field(foreign_key="brands.id", primary_key=True, ondelete="CASCADE")
+    low_wins: int = 0
+    high_wins: int = 0
+    ties: int = 0
+    last_played_at: datetime | None = None
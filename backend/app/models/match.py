@@ -1,9 +1,26 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 import uuid
 from datetime import datetime
 
+# Carried in the per-brand history indexes so those reads are index-only
+_HISTORY_COLUMNS = [
+    "winner_id", "loser_id", "winner_elo_before", "winner_elo_after",
+    "loser_elo_before", "loser_elo_after", "is_tie",
+]
+
 class Match(SQLModel, table=True):
     __tablename__ = "matches"
+    __table_args__ = (
+        Index(
+            "ix_matches_winner_id_timestamp", "winner_id", "timestamp", "id",
+            postgresql_include=[c for c in _HISTORY_COLUMNS if c != "winner_id"],
+        ),
+        Index(
+            "ix_matches_loser_id_timestamp", "loser_id", "timestamp", "id",
+            postgresql_include=[c for c in _HISTORY_COLUMNS if c != "loser_id"],
+        ),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     winner_id: uuid.UUID
     loser_id: uuid.UUID
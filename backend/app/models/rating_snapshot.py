@@ -0,0 +1,15 @@
+import uuid
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+class RatingSnapshot(SQLModel, table=True):
+    """
+    A brand's Elo and global rank at a snapshot time. Rows are only written
+    when either changed, so a brand's history is a step function; old rows
+    are downsampled to one per day.
+    """
+    __tablename__ = "rating_snapshots"
+    brand_id: uuid.UUID = Field(foreign_key="brands.id", primary_key=True, ondelete="CASCADE")
+    taken_at: datetime = Field(primary_key=True, index=True)
+    elo: int
+    rank: int
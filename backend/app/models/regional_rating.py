@@ -0,0 +1,22 @@
+import uuid
+from sqlmodel import Field, SQLModel
+from sqlalchemy import Index, text
+
+class RegionalRating(SQLModel, table=True):
+    """
+    A brand's Elo and record from votes cast in one region (the vote's
+    location_country), rated with the same rules as the global Elo.
+    Rows exist only for brands that have played in the region.
+    """
+    __tablename__ = "regional_ratings"
+    __table_args__ = (
+        # Serves regional leaderboards: ORDER BY elo DESC, brand_id within a region
+        Index("ix_regional_ratings_region_elo_brand_id", "region", text("elo DESC"), "brand_id"),
+    )
+    region: str = Field(primary_key=True)
+    brand_id: uuid.UUID = Field(foreign_key="brands.id", primary_key=True, ondelete="CASCADE")
+    elo: int = Field(default=1200)
+    tier: str = Field(default="Unranked")
+    wins: int = 0
+    losses: int = 0
+    ties: int = 0
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+import uuid
+from typing import Literal
+
+from app.db.session import get_async_session
+from app.services.pagination import NEXT_CURSOR_HEADER
+from app.services.brand_service import AsyncBrandService
+from app.schemas.brand import BrandRead, BrandSuggestion
+
+# Async versions of the hot read endpoints, mounted ahead of the sync brands
+# router when ASYNC_DB is on; everything else falls through to the sync router.
+router = APIRouter()
+
+def get_service(session: AsyncSession = Depends(get_async_session)) -> AsyncBrandService:
+    return AsyncBrandService(session)
+
+@router.get("/random", response_model=list[BrandRead])
+async def get_random_pair(
+    country: str | None = None, 
+    mode: Literal["random", "informative"] = "random",
+    service: AsyncBrandService = Depends(get_service)
+):
+    return await service.get_random_pair(country_code=country, mode=mode)
+
+@router.get("/", response_model=list[BrandRead])
+async def read_brands(
+    response: Response,
+    search: str | None = None,
+    country: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: str | None = None,
+    service: AsyncBrandService = Depends(get_service)
+):
+    brands, next_cursor = await service.get_all(
+        search=search, limit=limit, offset=offset, country_code=country, cursor=cursor
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return brands
+
+@router.get("/autocomplete", response_model=list[BrandSuggestion])
+async def autocomplete_brands(
+    q: str,
+    limit: int = Query(10, ge=1, le=50),
+    country: str | None = None,
+    service: AsyncBrandService = Depends(get_service)
+):
+    return await service.autocomplete(q, limit=limit, country_code=country)
+
+@router.get("/leaderboard", response_model=list[BrandRead])
+async def get_leaderboard(
+    response: Response,
+    limit: int = 50, 
+    offset: int = 0, 
+    country: str | None = None,
+    order: Literal["elo", "bt"] = "elo",
+    region: str | None = None,
+    window: Literal["1d", "7d", "30d"] | None = None,
+    cursor: str | None = None,
+    service: AsyncBrandService = Depends(get_service)
+):
+    brands, next_cursor = await service.get_leaderboard(
+        limit, offset, country_code=country, order=order, cursor=cursor, region=region, window=window
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return brands
+
+# The uuid convertor keeps this from shadowing the sync router's other paths
+@router.get("/{brand_id:uuid}", response_model=BrandRead)
+async def get_brand(
+    brand_id: uuid.UUID, 
+    service: AsyncBrandService = Depends(get_service)
+):
+    return await service.get_by_id(brand_id)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_async_session
+from app.services.discovery_service import AsyncDiscoveryService
+from app.schemas.discovery import DiscoveryRequest
+from app.schemas.brand import BrandRead
+
+router = APIRouter()
+
+def get_service(session: AsyncSession = Depends(get_async_session)) -> AsyncDiscoveryService:
+    return AsyncDiscoveryService(session)
+
+@router.post("/discover", response_model=list[BrandRead])
+async def discover_brands(
+    payload: DiscoveryRequest,
+    service: AsyncDiscoveryService = Depends(get_service)
+):
+    return await service.discover_stores(payload.places)
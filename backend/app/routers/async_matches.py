@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.session import get_async_session
+from app.services.match_service import AsyncMatchService
+from app.schemas.match import MatchCreate, MatchResult
+
+router = APIRouter()
+
+def get_match_service(session: AsyncSession = Depends(get_async_session)) -> AsyncMatchService:
+    return AsyncMatchService(session)
+
+@router.post("/", response_model=MatchResult)
+async def record_match(
+    match_data: MatchCreate, 
+    service: AsyncMatchService = Depends(get_match_service)
+):
+    return await service.record_match(match_data)
+
+@router.post("/batch", response_model=list[MatchResult])
+async def record_matches(
+    matches: list[MatchCreate], 
+    service: AsyncMatchService = Depends(get_match_service)
+):
+    """
+    Records an ordered list of votes (e.g. replayed from an offline kiosk)
+    in one transaction and returns one result per vote, in order.
+    """
+    return await service.record_matches(matches)
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Response, status, Query
 from sqlmodel import Session
 import uuid
+from typing import Literal
 
 from app.db.session import get_session
+from app.services.pagination import NEXT_CURSOR_HEADER
 from app.services.brand_service import BrandService
-from app.schemas.brand import BrandCreate, BrandRead, BrandUpdate
+from app.services.head_to_head import HeadToHeadService
+from app.services.match_service import MatchService
+from app.schemas.brand import BrandCount, BrandCreate, BrandRead, BrandSuggestion, BrandUpdate, RatingPoint
+from app.schemas.head_to_head import HeadToHeadRead
+from app.schemas.match import MatchHistoryEntry
 from app.schemas.response import StandardResponse
 
 router = APIRouter()
@@ -12,29 +18,71 @@ router = APIRouter()
 def get_service(session: Session = Depends(get_session)) -> BrandService:
     return BrandService(session)
 
+def get_match_service(session: Session = Depends(get_session)) -> MatchService:
+    return MatchService(session)
+
+def get_head_to_head_service(session: Session = Depends(get_session)) -> HeadToHeadService:
+    return HeadToHeadService(session)
+
 @router.get("/random", response_model=list[BrandRead])
 def get_random_pair(
     country: str | None = None, 
+    mode: Literal["random", "informative"] = "random",
     service: BrandService = Depends(get_service)
 ):
-    return service.get_random_pair(country_code=country)
+    return service.get_random_pair(country_code=country, mode=mode)
 
 @router.get("/", response_model=list[BrandRead])
 def read_brands(
+    response: Response,
     search: str | None = None,
+    country: str | None = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
+    service: BrandService = Depends(get_service)
+):
+    brands, next_cursor = service.get_all(
+        search=search, limit=limit, offset=offset, country_code=country, cursor=cursor
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return brands
+
+@router.get("/count", response_model=BrandCount)
+def count_brands(
+    country: str | None = None,
     service: BrandService = Depends(get_service)
 ):
-    return service.get_all(search=search, limit=limit, offset=offset)
+    return BrandCount(count=service.count(country_code=country))
+
+@router.get("/autocomplete", response_model=list[BrandSuggestion])
+def autocomplete_brands(
+    q: str,
+    limit: int = Query(10, ge=1, le=50),
+    country: str | None = None,
+    service: BrandService = Depends(get_service)
+):
+    return service.autocomplete(q, limit=limit, country_code=country)
 
 @router.get("/leaderboard", response_model=list[BrandRead])
 def get_leaderboard(
+    response: Response,
     limit: int = 50, 
     offset: int = 0, 
+    country: str | None = None,
+    order: Literal["elo", "bt"] = "elo",
+    region: str | None = None,
+    window: Literal["1d", "7d", "30d"] | None = None,
+    cursor: str | None = None,
     service: BrandService = Depends(get_service)
 ):
-    return service.get_leaderboard(limit, offset)
+    brands, next_cursor = service.get_leaderboard(
+        limit, offset, country_code=country, order=order, cursor=cursor, region=region, window=window
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return brands
 
 @router.get("/{brand_id}", response_model=BrandRead)
 def get_brand(
@@ -43,6 +91,43 @@ def get_brand(
 ):
     return service.get_by_id(brand_id)
 
+@router.get("/{brand_id}/history", response_model=list[RatingPoint])
+def get_brand_history(
+    brand_id: uuid.UUID,
+    days: int = Query(30, ge=1, le=365),
+    service: BrandService = Depends(get_service)
+):
+    return service.get_history(brand_id, days=days)
+
+@router.get("/{brand_id}/matches", response_model=list[MatchHistoryEntry])
+def get_brand_matches(
+    brand_id: uuid.UUID,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    service: MatchService = Depends(get_match_service)
+):
+    matches, next_cursor = service.get_brand_matches(brand_id, limit=limit, cursor=cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return matches
+
+@router.get("/{brand_id}/vs/{opponent_id}", response_model=HeadToHeadRead)
+def get_head_to_head(
+    brand_id: uuid.UUID,
+    opponent_id: uuid.UUID,
+    service: HeadToHeadService = Depends(get_head_to_head_service)
+):
+    return service.get_pair(brand_id, opponent_id)
+
+@router.get("/{brand_id}/rivals", response_model=list[HeadToHeadRead])
+def get_rivals(
+    brand_id: uuid.UUID,
+    limit: int = Query(10, ge=1, le=50),
+    service: HeadToHeadService = Depends(get_head_to_head_service)
+):
+    return service.get_rivals(brand_id, limit=limit)
+
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=StandardResponse)
 def create_brand(
     brand: BrandCreate, 
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Response, status
+
+from app.core.warmup import readiness
+from app.schemas.health import ReadinessStatus
+from app.schemas.response import StandardResponse
+
+router = APIRouter()
+
+@router.get("/live", response_model=StandardResponse)
+def liveness():
+    return StandardResponse(message="alive")
+
+@router.get("/ready", response_model=ReadinessStatus)
+def get_readiness(response: Response):
+    """
+    Reports whether the startup warm-up has finished loading in-memory
+    indexes and the NLP model. Returns 503 until it has.
+    """
+    components = readiness()
+    ready = all(components.values())
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessStatus(ready=ready, components=components)
@@ -15,4 +15,15 @@ def record_match(
     match_data: MatchCreate, 
     service: MatchService = Depends(get_match_service)
 ):
-    return service.record_match(match_data)
\ No newline at end of file
+    return service.record_match(match_data)
+
+@router.post("/batch", response_model=list[MatchResult])
+def record_matches(
+    matches: list[MatchCreate], 
+    service: MatchService = Depends(get_match_service)
+):
+    """
+    Records an ordered list of votes (e.g. replayed from an offline kiosk)
+    in one transaction and returns one result per vote, in order.
+    """
+    return service.record_matches(matches)
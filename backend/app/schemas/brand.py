@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import date
+from datetime import date, datetime
 import uuid
 
 class BrandBase(BaseModel):
@@ -24,6 +24,13 @@ class BrandUpdate(BaseModel):
     regions_present: Optional[list[str]] = None
     total_locations: Optional[int] = None
 
+class WindowStats(BaseModel):
+    window: str
+    wins: int
+    losses: int
+    ties: int
+    elo_change: int
+
 class BrandRead(BrandBase):
     id: uuid.UUID
     elo: int
@@ -32,6 +39,27 @@ class BrandRead(BrandBase):
     ties: int = 0
     tier: str
     rank: int | None = None
+    bt_rating: float | None = None
+    # Maintained by rating_history.update_trends
+    elo_trend: float = 0.0
+    rank_trend: int = 0
+    # Set on regional leaderboards, where elo/tier/record are that region's
+    region: str | None = None
+    # Set on windowed leaderboards (?window=7d)
+    window_stats: WindowStats | None = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BrandCount(BaseModel):
+    count: int
+
+class BrandSuggestion(BaseModel):
+    id: uuid.UUID
+    name: str
+    logo_url: str | None = None
+
+class RatingPoint(BaseModel):
+    taken_at: datetime
+    elo: int
+    rank: int
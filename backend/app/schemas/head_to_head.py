@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from datetime import datetime
+import uuid
+
+class HeadToHeadRead(BaseModel):
+    """Results between two brands from `brand_id`'s side."""
+    brand_id: uuid.UUID
+    opponent_id: uuid.UUID
+    opponent_name: str | None = None
+    wins: int = 0
+    losses: int = 0
+    ties: int = 0
+    games: int = 0
+    last_played_at: datetime | None = None
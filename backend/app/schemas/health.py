@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+class ReadinessStatus(BaseModel):
+    ready: bool
+    components: dict[str, bool]
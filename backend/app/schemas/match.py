@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
+from datetime import datetime
 import uuid
 
 class MatchCreate(BaseModel):
@@ -15,4 +16,16 @@ class MatchResult(BaseModel):
     winner_elo_change: int
     loser_id: uuid.UUID
     loser_new_elo: int
-    loser_elo_change: int
\ No newline at end of file
+    loser_elo_change: int
+
+class MatchHistoryEntry(BaseModel):
+    """One match from a single brand's point of view."""
+    id: uuid.UUID
+    timestamp: datetime
+    outcome: Literal["win", "loss", "tie"]
+    elo_before: int
+    elo_after: int
+    opponent_id: uuid.UUID
+    opponent_name: str | None = None
+    opponent_elo_before: int
+    opponent_elo_after: int
@@ -0,0 +1,189 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import delete, func, text, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.models.brand_activity import BrandActivityDaily, BrandActivityHourly
+
+# Leaderboard windows served from the rollups
+WINDOWS = {"1d": timedelta(days=1), "7d": timedelta(days=7), "30d": timedelta(days=30)}
+# Whole days older than this are folded from hourly into daily rows
+HOURLY_RETENTION_DAYS = 2
+
+# One row per brand per match, as the rollups count them
+_SIDES = """
+    sides AS (
+        SELECT m.timestamp AS played_at, m.winner_id AS brand_id,
+               CASE WHEN m.is_tie THEN 0 ELSE 1 END AS wins, 0 AS losses,
+               CASE WHEN m.is_tie THEN 1 ELSE 0 END AS ties,
+               m.winner_elo_after - m.winner_elo_before AS elo_change
+        FROM matches m WHERE m.winner_id <> m.loser_id
+        UNION ALL
+        SELECT m.timestamp, m.loser_id,
+               0, CASE WHEN m.is_tie THEN 0 ELSE 1 END,
+               CASE WHEN m.is_tie THEN 1 ELSE 0 END,
+               m.loser_elo_after - m.loser_elo_before
+        FROM matches m WHERE m.winner_id <> m.loser_id
+    )
+"""
+
+_BACKFILL = """
+    WITH {sides}
+    INSERT INTO {table} (bucket, brand_id, wins, losses, ties, elo_change)
+    SELECT date_trunc('{unit}', s.played_at), s.brand_id,
+           SUM(s.wins), SUM(s.losses), SUM(s.ties), SUM(s.elo_change)
+    FROM sides s
+    JOIN brands b ON b.id = s.brand_id
+    WHERE s.played_at {comparison} :cutoff
+    GROUP BY 1, 2
+"""
+
+_FOLD_HOURS = """
+    INSERT INTO brand_activity_daily (bucket, brand_id, wins, losses, ties, elo_change)
+    SELECT date_trunc('day', bucket), brand_id, SUM(wins), SUM(losses), SUM(ties), SUM(elo_change)
+    FROM brand_activity_hourly
+    WHERE bucket < :cutoff
+    GROUP BY 1, 2
+    ON CONFLICT (bucket, brand_id) DO UPDATE SET
+        wins = brand_activity_daily.wins + excluded.wins,
+        losses = brand_activity_daily.losses + excluded.losses,
+        ties = brand_activity_daily.ties + excluded.ties,
+        elo_change = brand_activity_daily.elo_change + excluded.elo_change
+"""
+
+
+def _hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def record_activity(
+    session: Session,
+    applied: Iterable[tuple[uuid.UUID, int, int, uuid.UUID, int, int, bool, datetime]],
+) -> None:
+    """
+    Adds applied votes (winner_id, winner elo before/after, loser_id, loser
+    elo before/after, is_tie, played_at) to the hourly rollup with a single
+    INSERT ... ON CONFLICT DO UPDATE, written in key order.
+    Added to the caller's transaction; the caller commits.
+    """
+    totals: dict[tuple[datetime, uuid.UUID], list[int]] = {}
+    for winner_id, winner_before, winner_after, loser_id, loser_before, loser_after, is_tie, played_at in applied:
+        hour = _hour(played_at)
+        winner = totals.setdefault((hour, winner_id), [0, 0, 0, 0])
+        loser = totals.setdefault((hour, loser_id), [0, 0, 0, 0])
+        if is_tie:
+            winner[2] += 1
+            loser[2] += 1
+        else:
+            winner[0] += 1
+            loser[1] += 1
+        winner[3] += winner_after - winner_before
+        loser[3] += loser_after - loser_before
+    if not totals:
+        return
+
+    statement = insert(BrandActivityHourly).values([
+        {
+            "bucket": bucket, "brand_id": brand_id,
+            "wins": wins, "losses": losses, "ties": ties, "elo_change": elo_change,
+        }
+        for (bucket, brand_id), (wins, losses, ties, elo_change) in sorted(totals.items())
+    ])
+    session.exec(statement.on_conflict_do_update(
+        index_elements=[BrandActivityHourly.bucket, BrandActivityHourly.brand_id],
+        set_={
+            "wins": BrandActivityHourly.wins + statement.excluded.wins,
+            "losses": BrandActivityHourly.losses + statement.excluded.losses,
+            "ties": BrandActivityHourly.ties + statement.excluded.ties,
+            "elo_change": BrandActivityHourly.elo_change + statement.excluded.elo_change,
+        },
+    ))
+
+
+def window_totals(window: str, now: datetime | None = None):
+    """
+    Subquery of (brand_id, wins, losses, ties, elo_change) summed over the
+    window, read only from the rollups. Hourly rows are exact to the hour;
+    folded days count whole, so long windows may reach up to a day further back.
+    """
+    since = (now or datetime.utcnow()) - WINDOWS[window]
+    rows = union_all(
+        select(
+            BrandActivityHourly.brand_id, BrandActivityHourly.wins, BrandActivityHourly.losses,
+            BrandActivityHourly.ties, BrandActivityHourly.elo_change,
+        ).where(BrandActivityHourly.bucket >= _hour(since)),
+        select(
+            BrandActivityDaily.brand_id, BrandActivityDaily.wins, BrandActivityDaily.losses,
+            BrandActivityDaily.ties, BrandActivityDaily.elo_change,
+        ).where(BrandActivityDaily.bucket >= _day(since)),
+    ).subquery()
+    return (
+        select(
+            rows.c.brand_id,
+            func.sum(rows.c.wins).label("wins"),
+            func.sum(rows.c.losses).label("losses"),
+            func.sum(rows.c.ties).label("ties"),
+            func.sum(rows.c.elo_change).label("elo_change"),
+        )
+        .group_by(rows.c.brand_id)
+        .subquery()
+    )
+
+
+class ActivityService:
+    """
+    Maintenance for the activity rollups (scripts/compact_activity.py).
+    Everything runs in the caller's transaction; the caller commits.
+    compact and rebuild hold one advisory lock until then, so two runs never
+    fold the same hours twice.
+    """
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _lock_maintenance(self) -> None:
+        self.session.exec(text("SELECT pg_advisory_xact_lock(hashtext('brand_activity_maintenance'))"))
+
+    def compact(self, now: datetime | None = None, hourly_days: int = HOURLY_RETENTION_DAYS) -> int:
+        """
+        Folds the hourly rows of whole days older than `hourly_days` into
+        daily rows and deletes them. Returns hourly rows removed.
+        """
+        cutoff = _day(now or datetime.utcnow()) - timedelta(days=hourly_days)
+        self._lock_maintenance()
+        self.session.connection().execute(text(_FOLD_HOURS), {"cutoff": cutoff})
+        result = self.session.exec(delete(BrandActivityHourly).where(BrandActivityHourly.bucket < cutoff))
+        return result.rowcount
+
+    def prune(self, keep_days: int, now: datetime | None = None) -> int:
+        """Drops daily rows older than `keep_days`. Returns rows removed."""
+        cutoff = _day(now or datetime.utcnow()) - timedelta(days=keep_days)
+        result = self.session.exec(delete(BrandActivityDaily).where(BrandActivityDaily.bucket < cutoff))
+        return result.rowcount
+
+    def rebuild(self, now: datetime | None = None, hourly_days: int = HOURLY_RETENTION_DAYS) -> int:
+        """
+        Recomputes both rollups from the match log, already compacted.
+        Votes writing rollups wait until the caller's transaction ends.
+        Returns rows written.
+        """
+        cutoff = _day(now or datetime.utcnow()) - timedelta(days=hourly_days)
+        self._lock_maintenance()
+        self.session.exec(text("LOCK TABLE brand_activity_hourly, brand_activity_daily IN EXCLUSIVE MODE"))
+        self.session.exec(delete(BrandActivityHourly))
+        self.session.exec(delete(BrandActivityDaily))
+
+        written = 0
+        for table, unit, comparison in (
+            ("brand_activity_hourly", "hour", ">="),
+            ("brand_activity_daily", "day", "<"),
+        ):
+            statement = _BACKFILL.format(sides=_SIDES, table=table, unit=unit, comparison=comparison)
+            written += self.session.connection().execute(text(statement), {"cutoff": cutoff}).rowcount
+        return written
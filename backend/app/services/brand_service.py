@@ -1,29 +1,45 @@
-from sqlmodel import Session, select, col, func
+from sqlmodel import Session, select, func, and_, or_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Literal, Sequence
 from fastapi import HTTPException
 import uuid
+from datetime import datetime, timedelta
+from functools import partial
 
+from app.core import indexes
+from app.core.brand_name_index import brand_name_index
+from app.core.metrics import timed
+from app.core.leaderboard_cache import leaderboard_cache
+from app.core.matchmaker import matchmaker
+from app.core.pair_sampler import pair_sampler
 from app.models.brand import Brand
-from app.schemas.brand import BrandCreate, BrandUpdate, BrandRead
+from app.models.rating_snapshot import RatingSnapshot
+from app.models.regional_rating import RegionalRating
+from app.schemas.brand import BrandCreate, BrandUpdate, BrandRead, BrandSuggestion, RatingPoint, WindowStats
+from app.services.activity import WINDOWS, window_totals
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.ranking import populate_ranks
+from app.services.regions import in_region, set_brand_regions
 
 class BrandService:
     def __init__(self, session: Session):
         self.session = session
 
-    def _populate_rank(self, brand_read: BrandRead) -> BrandRead:
+    def _populate_ranks(self, brands: Sequence[Brand]) -> list[BrandRead]:
         """
-        Calculates the Global Rank for a single brand by counting 
-        how many brands have a higher ELO.
+        Converts brands to Read Schemas with their Global Rank
+        (1 + number of brands with a higher ELO) attached in one batch.
         """
-        higher_elo_count = self.session.exec(
-            select(func.count()).select_from(Brand).where(Brand.elo > brand_read.elo)
-        ).one()
-        brand_read.rank = higher_elo_count + 1
-        return brand_read
+        return populate_ranks(self.session, brands)
 
     def create(self, brand_data: BrandCreate) -> Brand:
         brand_db = Brand.model_validate(brand_data)
         self.session.add(brand_db)
+        set_brand_regions(self.session, brand_db.id, brand_db.regions_present)
         self.session.commit()
+        indexes.brand_created(
+            brand_db.id, brand_db.name, brand_db.elo, brand_db.regions_present, brand_db.logo_url
+        )
         return brand_db
 
     def get_by_id(self, brand_id: uuid.UUID) -> BrandRead:
@@ -31,7 +47,32 @@ class BrandService:
         if not brand:
             raise HTTPException(status_code=404, detail="Brand not found")
         
-        return self._populate_rank(BrandRead.model_validate(brand))
+        return self._populate_ranks([brand])[0]
+
+    def get_history(self, brand_id: uuid.UUID, days: int = 30) -> list[RatingPoint]:
+        """
+        Elo/rank snapshots for the last `days`, oldest first, for sparklines.
+        Snapshots are only written on change, so the one in force at the start
+        of the window is included as the first point.
+        """
+        if not self.session.get(Brand, brand_id):
+            raise HTTPException(status_code=404, detail="Brand not found")
+
+        since = datetime.utcnow() - timedelta(days=days)
+        baseline = self.session.exec(
+            select(RatingSnapshot)
+            .where(RatingSnapshot.brand_id == brand_id, RatingSnapshot.taken_at <= since)
+            .order_by(RatingSnapshot.taken_at.desc())
+            .limit(1)
+        ).first()
+        snapshots = self.session.exec(
+            select(RatingSnapshot)
+            .where(RatingSnapshot.brand_id == brand_id, RatingSnapshot.taken_at > since)
+            .order_by(RatingSnapshot.taken_at)
+        ).all()
+
+        points = ([baseline] if baseline else []) + list(snapshots)
+        return [RatingPoint(taken_at=p.taken_at, elo=p.elo, rank=p.rank) for p in points]
 
     def update(self, brand_id: uuid.UUID, brand_data: BrandUpdate) -> Brand:
         brand = self.session.get(Brand, brand_id)
@@ -43,34 +84,134 @@ class BrandService:
             setattr(brand, key, value)
             
         self.session.add(brand)
+        if "regions_present" in update_data:
+            set_brand_regions(self.session, brand.id, brand.regions_present)
         self.session.commit()
+        if "name" in update_data or "logo_url" in update_data:
+            indexes.brand_details_changed(brand.id, brand.name, brand.logo_url)
+        if "regions_present" in update_data:
+            indexes.brand_regions_changed(brand.id, brand.regions_present)
         return brand
 
     def delete(self, brand_id: uuid.UUID) -> None:
         brand = self.session.get(Brand, brand_id)
         if brand:
+            elo = brand.elo
             self.session.delete(brand)
             self.session.commit()
+            indexes.brand_deleted(brand_id, elo)
     
-    def get_random_pair(self, country_code: str | None = None) -> list[BrandRead]:
-        statement = select(Brand).order_by(func.random())
-        
-        candidates = []
+    def _draw_pair(
+        self, country_code: str | None, mode: Literal["random", "informative"]
+    ) -> tuple[uuid.UUID, uuid.UUID] | None:
+        pair_sampler.ensure_fresh(self.session)
+        if mode == "informative":
+            matchmaker.ensure_fresh(self.session)
+            eligible = (lambda brand_id: pair_sampler.in_pool(brand_id, country_code)) if country_code else None
+            pair = matchmaker.choose_pair(eligible)
+            if pair is not None:
+                return pair
+        return pair_sampler.sample_pair(country_code)
+
+    @timed("brands.get_random_pair")
+    def get_random_pair(
+        self, country_code: str | None = None, mode: Literal["random", "informative"] = "random"
+    ) -> list[BrandRead]:
+        """
+        Returns two distinct brands to vote on. "random" draws uniformly;
+        "informative" favours close ratings, uncertain brands and new pairings.
+        """
+        # A sampled brand may have been deleted by another worker since the
+        # sampler was loaded; drop it and draw again.
+        for _ in range(3):
+            pair = self._draw_pair(country_code, mode)
+            if pair is None:
+                break
+
+            brands = {
+                b.id: b for b in self.session.exec(select(Brand).where(Brand.id.in_(pair))).all()
+            }
+            if len(brands) == 2:
+                return self._populate_ranks([brands[brand_id] for brand_id in pair])
+
+            for brand_id in pair:
+                if brand_id not in brands:
+                    pair_sampler.remove(brand_id)
+                    matchmaker.remove(brand_id)
+
+        raise HTTPException(status_code=404, detail="Not enough brands to make a pair")
+    
+    @timed("brands.get_leaderboard")
+    def get_leaderboard(
+        self, limit: int = 50, offset: int = 0, country_code: str | None = None,
+        order: Literal["elo", "bt"] = "elo", cursor: str | None = None,
+        region: str | None = None, window: str | None = None,
+    ) -> tuple[list[BrandRead], str | None]:
+        """
+        Brands by ELO, or by the batch Bradley-Terry fit with order="bt".
+        With `country_code`, only brands present there (or "Global") are
+        listed and ranks are positions within that region.
+        With `region`, brands are ranked by their Elo from votes cast in that
+        region; elo, tier and record in the result are the regional ones.
+        With `window` (e.g. "7d"), brands that played in the window are ranked
+        by Elo gained over it, read from the activity rollups only.
+
+        Returns (page, next_cursor). Passing `cursor` continues after the
+        previous page by keyset on (rating, id), or on (elo gained, wins, id)
+        for a window, so deep pages cost the same as the first and ranks
+        carry over without recounting.
+        The top of each variant is served from the in-memory leaderboard cache.
+        """
+        if region and order != "elo":
+            raise HTTPException(status_code=400, detail="Regional leaderboards are ordered by Elo")
+        if window and (region or order != "elo"):
+            raise HTTPException(status_code=400, detail="Windowed leaderboards are global and ordered by Elo gained")
+        if window and window not in WINDOWS:
+            raise HTTPException(status_code=400, detail=f"window must be one of {', '.join(WINDOWS)}")
+
+        if window:
+            query = partial(self._query_window_leaderboard, country_code=country_code, window=window)
+        elif region:
+            query = partial(self._query_regional_leaderboard, country_code=country_code, region=region)
+        else:
+            query = partial(self._query_leaderboard, country_code=country_code, order=order)
+
+        if cursor:
+            results = query(limit, 0, after=decode_cursor(cursor))
+        else:
+            results = leaderboard_cache.get(
+                (country_code, order, region, window), offset, limit, lambda size: query(size, 0),
+            )
+            if results is None:
+                results = query(limit, offset)
+
+        next_cursor = None
+        if results and len(results) == limit:
+            last = results[-1]
+            if window:
+                key = {"v": last.window_stats.elo_change, "w": last.window_stats.wins}
+            else:
+                key = {"v": last.bt_rating if order == "bt" else last.elo}
+            next_cursor = encode_cursor({**key, "id": last.id, "r": last.rank})
+        return results, next_cursor
+
+    def _query_leaderboard(
+        self, limit: int, offset: int, country_code: str | None, order: Literal["elo", "bt"],
+        after: dict | None = None,
+    ) -> list[BrandRead]:
+        statement = select(Brand)
         if country_code:
-            raw_candidates = self.session.exec(statement.limit(50)).all()
-            
-            filtered = [
-                b for b in raw_candidates 
-                if country_code in (b.regions_present or []) or "Global" in (b.regions_present or [])
-            ]
-            candidates = filtered[:2] if len(filtered) >= 2 else raw_candidates[:2]
+            statement = statement.where(in_region(country_code))
+
+        if after is not None:
+            statement = statement.where(self._leaderboard_after(after, order))
+            offset = after.get("r", 0)
+
+        if order == "bt":
+            statement = statement.order_by(Brand.bt_rating.desc().nulls_last(), Brand.id)
         else:
-            candidates = self.session.exec(statement.limit(2)).all()
-            
-        return [self._populate_rank(BrandRead.model_validate(b)) for b in candidates]
-    
-    def get_leaderboard(self, limit: int = 50, offset: int = 0) -> list[BrandRead]:
-        statement = select(Brand).order_by(Brand.elo.desc()).offset(offset).limit(limit)
+            statement = statement.order_by(Brand.elo.desc(), Brand.id)
+        statement = statement.offset(0 if after is not None else offset).limit(limit)
         brands = self.session.exec(statement).all()
         
         results = []
@@ -81,12 +222,249 @@ class BrandService:
             
         return results
 
-    def get_all(self, search: str | None = None, limit: int = 100, offset: int = 0) -> list[BrandRead]:
-        statement = select(Brand)
-        
+    def _query_regional_leaderboard(
+        self, limit: int, offset: int, country_code: str | None, region: str,
+        after: dict | None = None,
+    ) -> list[BrandRead]:
+        statement = (
+            select(Brand, RegionalRating)
+            .join(RegionalRating, RegionalRating.brand_id == Brand.id)
+            .where(RegionalRating.region == region)
+        )
+        if country_code:
+            statement = statement.where(in_region(country_code))
+
+        if after is not None:
+            try:
+                last_id = uuid.UUID(str(after["id"]))
+                value = after["v"]
+            except (KeyError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            statement = statement.where(or_(
+                RegionalRating.elo < value,
+                and_(RegionalRating.elo == value, RegionalRating.brand_id > last_id),
+            ))
+            offset = after.get("r", 0)
+
+        statement = (
+            statement.order_by(RegionalRating.elo.desc(), RegionalRating.brand_id)
+            .offset(0 if after is not None else offset)
+            .limit(limit)
+        )
+
+        results = []
+        for index, (brand, rating) in enumerate(self.session.exec(statement).all()):
+            b_read = BrandRead.model_validate(brand)
+            b_read.elo = rating.elo
+            b_read.tier = rating.tier
+            b_read.wins = rating.wins
+            b_read.losses = rating.losses
+            b_read.ties = rating.ties
+            b_read.region = region
+            b_read.rank = offset + index + 1
+            results.append(b_read)
+        return results
+
+    def _query_window_leaderboard(
+        self, limit: int, offset: int, country_code: str | None, window: str,
+        after: dict | None = None,
+    ) -> list[BrandRead]:
+        totals = window_totals(window)
+        statement = select(
+            Brand, totals.c.wins, totals.c.losses, totals.c.ties, totals.c.elo_change,
+        ).join(totals, totals.c.brand_id == Brand.id)
+        if country_code:
+            statement = statement.where(in_region(country_code))
+
+        if after is not None:
+            statement = statement.where(self._window_after(after, totals))
+            offset = after.get("r", 0)
+
+        statement = (
+            statement.order_by(totals.c.elo_change.desc(), totals.c.wins.desc(), Brand.id)
+            .offset(0 if after is not None else offset)
+            .limit(limit)
+        )
+
+        results = []
+        for index, (brand, wins, losses, ties, elo_change) in enumerate(self.session.exec(statement).all()):
+            b_read = BrandRead.model_validate(brand)
+            b_read.window_stats = WindowStats(
+                window=window, wins=wins, losses=losses, ties=ties, elo_change=elo_change
+            )
+            b_read.rank = offset + index + 1
+            results.append(b_read)
+        return results
+
+    @staticmethod
+    def _leaderboard_after(after: dict, order: Literal["elo", "bt"]):
+        """Rows strictly after the cursor in (rating DESC, id ASC) order."""
+        try:
+            last_id = uuid.UUID(str(after["id"]))
+            value = after["v"]
+        except (KeyError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        if order == "bt":
+            if value is None:
+                # Already inside the unrated tail (sorted last)
+                return and_(Brand.bt_rating.is_(None), Brand.id > last_id)
+            return or_(
+                Brand.bt_rating < value,
+                and_(Brand.bt_rating == value, Brand.id > last_id),
+                Brand.bt_rating.is_(None),
+            )
+        return or_(Brand.elo < value, and_(Brand.elo == value, Brand.id > last_id))
+
+    @staticmethod
+    def _window_after(after: dict, totals):
+        """Rows strictly after the cursor in (elo_change DESC, wins DESC, id ASC) order."""
+        try:
+            last_id = uuid.UUID(str(after["id"]))
+            elo_change = int(after["v"])
+            wins = int(after["w"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        return or_(
+            totals.c.elo_change < elo_change,
+            and_(totals.c.elo_change == elo_change, totals.c.wins < wins),
+            and_(totals.c.elo_change == elo_change, totals.c.wins == wins, Brand.id > last_id),
+        )
+
+    @timed("brands.get_all")
+    def get_all(
+        self, search: str | None = None, limit: int = 100, offset: int = 0,
+        country_code: str | None = None, cursor: str | None = None,
+    ) -> tuple[list[BrandRead], str | None]:
+        """
+        Brands by name. Returns (page, next_cursor); passing `cursor`
+        continues by keyset on (name, id) instead of OFFSET.
+        With `search`, matches come from the in-memory name index ranked by
+        match quality instead.
+        """
         if search:
-            statement = statement.where(col(Brand.name).ilike(f"%{search}%"))
-            
+            return self._search(search, limit, offset, country_code, cursor)
+
+        statement = select(Brand)
+        if country_code:
+            statement = statement.where(in_region(country_code))
+
+        if cursor:
+            after = decode_cursor(cursor)
+            try:
+                last_name, last_id = after["name"], uuid.UUID(str(after["id"]))
+            except (KeyError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            statement = statement.where(
+                or_(Brand.name > last_name, and_(Brand.name == last_name, Brand.id > last_id))
+            )
+            offset = 0
+
+        statement = statement.order_by(Brand.name, Brand.id)
         brands = self.session.exec(statement.offset(offset).limit(limit)).all()
+
+        next_cursor = None
+        if brands and len(brands) == limit:
+            next_cursor = encode_cursor({"name": brands[-1].name, "id": brands[-1].id})
         
-        return [self._populate_rank(BrandRead.model_validate(b)) for b in brands]
\ No newline at end of file
+        return self._populate_ranks(brands), next_cursor
+
+    def _search(
+        self, search: str, limit: int, offset: int, country_code: str | None, cursor: str | None,
+    ) -> tuple[list[BrandRead], str | None]:
+        # Ranked hits have no stable keyset, so the cursor is a position in the ranking
+        if cursor:
+            try:
+                offset = int(decode_cursor(cursor)["pos"])
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        ids = brand_name_index.search(search, limit=offset + limit, eligible=self._region_filter(country_code))
+        page_ids = ids[offset:]
+        brands = {
+            b.id: b for b in self.session.exec(select(Brand).where(Brand.id.in_(page_ids))).all()
+        } if page_ids else {}
+
+        next_cursor = encode_cursor({"pos": offset + limit}) if len(ids) == offset + limit else None
+        return self._populate_ranks([brands[i] for i in page_ids if i in brands]), next_cursor
+
+    @timed("brands.autocomplete")
+    def autocomplete(
+        self, prefix: str, limit: int = 10, country_code: str | None = None
+    ) -> list[BrandSuggestion]:
+        """Top prefix matches for the search box, straight from the name index."""
+        suggestions = brand_name_index.autocomplete(
+            prefix, limit=limit, eligible=self._region_filter(country_code)
+        )
+        return [
+            BrandSuggestion(id=brand_id, name=name, logo_url=logo_url)
+            for brand_id, name, logo_url in suggestions
+        ]
+
+    def _region_filter(self, country_code: str | None):
+        brand_name_index.ensure_fresh(self.session)
+        if not country_code:
+            return None
+        pair_sampler.ensure_fresh(self.session)
+        return lambda brand_id: pair_sampler.in_pool(brand_id, country_code)
+
+    def count(self, country_code: str | None = None) -> int:
+        statement = select(func.count()).select_from(Brand)
+        if country_code:
+            statement = statement.where(in_region(country_code))
+        return self.session.exec(statement).one()
+
+
+class AsyncBrandService:
+    """
+    Async facade over BrandService. Each call runs the sync service inside
+    AsyncSession.run_sync, so its queries await the async driver without
+    duplicating any of the service logic. Cold in-memory indexes are loaded
+    on a worker thread first, never inside run_sync on the event loop.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _run_sync(self, fn):
+        await indexes.ensure_ready()
+        return await self.session.run_sync(fn)
+
+    async def get_by_id(self, brand_id: uuid.UUID) -> BrandRead:
+        return await self._run_sync(lambda s: BrandService(s).get_by_id(brand_id))
+
+    async def get_random_pair(
+        self, country_code: str | None = None, mode: Literal["random", "informative"] = "random"
+    ) -> list[BrandRead]:
+        return await self._run_sync(
+            lambda s: BrandService(s).get_random_pair(country_code=country_code, mode=mode)
+        )
+
+    async def get_leaderboard(
+        self, limit: int = 50, offset: int = 0, country_code: str | None = None,
+        order: Literal["elo", "bt"] = "elo", cursor: str | None = None,
+        region: str | None = None, window: str | None = None,
+    ) -> tuple[list[BrandRead], str | None]:
+        return await self._run_sync(
+            lambda s: BrandService(s).get_leaderboard(
+                limit, offset, country_code=country_code, order=order, cursor=cursor,
+                region=region, window=window,
+            )
+        )
+
+    async def autocomplete(
+        self, prefix: str, limit: int = 10, country_code: str | None = None
+    ) -> list[BrandSuggestion]:
+        return await self._run_sync(
+            lambda s: BrandService(s).autocomplete(prefix, limit=limit, country_code=country_code)
+        )
+
+    async def get_all(
+        self, search: str | None = None, limit: int = 100, offset: int = 0,
+        country_code: str | None = None, cursor: str | None = None,
+    ) -> tuple[list[BrandRead], str | None]:
+        return await self._run_sync(
+            lambda s: BrandService(s).get_all(
+                search=search, limit=limit, offset=offset, country_code=country_code, cursor=cursor
+            )
+        )
@@ -1,42 +1,62 @@
+import asyncio
+import logging
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core import indexes
+from app.core.brand_name_index import brand_name_index
+from app.core.metrics import DISCOVERY_BATCH_SIZE, timed
 from app.models.brand import Brand
 from app.models.store import StoreLocation
 from app.schemas.brand import BrandRead
-from app.utils.text import clean_brand_name
-from thefuzz import process
+from app.services.ranking import populate_ranks
+from app.services.regions import add_brand_region
+from app.utils.text import clean_brand_names
 import uuid
 from datetime import date
 
+logger = logging.getLogger(__name__)
+
 class DiscoveryService:
     def __init__(self, session: Session):
         self.session = session
 
     # Update return type hint to return the Read Schema
+    @timed("discovery.discover_stores")
     def discover_stores(self, google_places: list) -> list[BrandRead]:
+        DISCOVERY_BATCH_SIZE.observe(len(google_places))
         brand_ids = set()
-        
+
+        # 1. CACHE CHECK (one lookup for the whole payload)
+        place_ids = {place.place_id for place in google_places}
+        known_stores = self.session.exec(
+            select(StoreLocation).where(StoreLocation.google_place_id.in_(place_ids))
+        ).all() if place_ids else []
+        store_brand_ids = {store.google_place_id: store.brand_id for store in known_stores}
+
+        # 2. CLEANING (one NLP batch for every uncached place)
+        uncached = [place for place in google_places if place.place_id not in store_brand_ids]
+        cleaned_names = dict(zip(
+            (place.place_id for place in uncached),
+            clean_brand_names([(place.name, place.types) for place in uncached]),
+        ))
+
+        new_brands: dict[uuid.UUID, Brand] = {}
+        region_changes: dict[uuid.UUID, list[str]] = {}
+        brand_name_index.ensure_fresh(self.session)
+
         for place in google_places:
             place_id = place.place_id
-            raw_name = place.name
             country = place.country
             city = place.city if place.city else "Unknown"
-            types = place.types if place.types else []
-
-            # 1. CACHE CHECK
-            store = self.session.exec(
-                select(StoreLocation).where(StoreLocation.google_place_id == place_id)
-            ).first()
 
-            if store:
-                brand_ids.add(store.brand_id)
-                continue 
+            if place_id in store_brand_ids:
+                brand_ids.add(store_brand_ids[place_id])
+                continue
 
-            # 2. CLEANING
-            cleaned_name = clean_brand_name(raw_name, google_types=types)
+            cleaned_name = cleaned_names[place_id]
             
             # 3. MATCHING
-            all_brands = self.session.exec(select(Brand)).all()
-            existing_brand = self._fuzzy_match_brand(cleaned_name, all_brands)
+            existing_brand = self._fuzzy_match_brand(cleaned_name, new_brands)
 
             if existing_brand:
                 brand = existing_brand
@@ -45,6 +65,9 @@ class DiscoveryService:
                 current_regions = brand.regions_present or []
                 if country not in current_regions:
                     brand.regions_present = list(set(current_regions + [country]))
+                    add_brand_region(self.session, brand.id, country)
+                    if brand.id not in new_brands:
+                        region_changes[brand.id] = brand.regions_present
                 
                 brand.total_locations = (brand.total_locations or 0) + 1
                 self.session.add(brand)
@@ -59,8 +82,8 @@ class DiscoveryService:
                 )
                 self._mock_enrich_brand(brand)
                 self.session.add(brand)
-                self.session.commit()
-                self.session.refresh(brand)
+                add_brand_region(self.session, brand.id, country)
+                new_brands[brand.id] = brand
 
             # Link Store
             new_store = StoreLocation(
@@ -70,41 +93,49 @@ class DiscoveryService:
                 city=city
             )
             self.session.add(new_store)
-            self.session.commit()
+            store_brand_ids[place_id] = brand.id
             
             brand_ids.add(brand.id)
 
+        # 4. Persist every new brand and store in one transaction
+        # (index entries are captured first; attributes expire on commit)
+        created = [
+            (b.id, b.name, b.elo, list(b.regions_present), b.logo_url) for b in new_brands.values()
+        ]
+        self.session.commit()
+        for brand_id, name, elo, regions, logo_url in created:
+            indexes.brand_created(brand_id, name, elo, regions, logo_url)
+        for brand_id, regions in region_changes.items():
+            indexes.brand_regions_changed(brand_id, regions)
+
         # --- RANK CALCULATION & SCHEMA CONVERSION ---
-        # 1. Get the raw DB models
         db_brands = self.session.exec(
             select(Brand).where(Brand.id.in_(brand_ids))
         ).all()
-        
-        results = []
-        for db_brand in db_brands:
-            # 2. Convert DB Model -> Read Schema (This object has the .rank field)
-            brand_read = BrandRead.model_validate(db_brand)
-            
-            # 3. Calculate Rank dynamically
-            higher_elo_count = self.session.exec(
-                select(Brand).where(Brand.elo > db_brand.elo)
-            ).all()
-            
-            # 4. Assign rank to the Schema object
-            brand_read.rank = len(higher_elo_count) + 1
-            results.append(brand_read)
-            
-        return results
 
-    def _fuzzy_match_brand(self, name: str, brands: list[Brand]) -> Brand | None:
-        if not brands: return None
-        brand_map = {b.name: b for b in brands}
-        match_name, score = process.extractOne(name, list(brand_map.keys()))
-        if score >= 85: return brand_map[match_name]
-        return None
+        return populate_ranks(self.session, db_brands)
+
+    @timed("discovery.fuzzy_match_brand")
+    def _fuzzy_match_brand(self, name: str, new_brands: dict[uuid.UUID, Brand]) -> Brand | None:
+        """
+        Finds an existing brand (or one created earlier in this payload) whose
+        name scores >= 85 against `name`, using the in-memory name index.
+        """
+        brand_id = brand_name_index.best_match(
+            name, extra_names={b.id: b.name for b in new_brands.values()}
+        )
+        if brand_id is None: return None
+        if brand_id in new_brands: return new_brands[brand_id]
+
+        brand = self.session.get(Brand, brand_id)
+        if brand is None:
+            # Deleted by another worker since the index was loaded
+            brand_name_index.remove(brand_id)
+            return self._fuzzy_match_brand(name, new_brands)
+        return brand
 
     def _mock_enrich_brand(self, brand: Brand):
-        print(f"🤖 [AGENT] Enriching metadata for: {brand.name}...")
+        logger.debug("Enriching metadata for %s", brand.name)
         
         if "Chatime" in brand.name:
             brand.description = "Global teahouse chain known for its purple branding."
@@ -123,4 +154,17 @@ class DiscoveryService:
             brand.website_url = f"https://www.google.com/search?q={brand.name}"
             brand.logo_url = "https://placehold.co/100"
             brand.country_of_origin = brand.regions_present[0] if brand.regions_present else "Unknown"
-            brand.established_date = date(2025, 1, 1)
\ No newline at end of file
+            brand.established_date = date(2025, 1, 1)
+
+
+class AsyncDiscoveryService:
+    """Async facade over DiscoveryService (see AsyncBrandService)."""
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def discover_stores(self, google_places: list) -> list[BrandRead]:
+        # Run the CPU-bound NLP cleaning off the event loop first; the sync
+        # service then finds every name in the cleaning cache.
+        await asyncio.to_thread(clean_brand_names, [(p.name, p.types) for p in google_places])
+        await indexes.ensure_ready()
+        return await self.session.run_sync(lambda s: DiscoveryService(s).discover_stores(google_places))
@@ -0,0 +1,148 @@
+import uuid
+from datetime import datetime
+from typing import Iterable
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, text, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from app.models.brand import Brand
+from app.models.head_to_head import HeadToHead
+from app.schemas.head_to_head import HeadToHeadRead
+
+# Same aggregation as the migration's backfill; Postgres orders uuids like Python does
+_BACKFILL = """
+    INSERT INTO head_to_head (brand_low_id, brand_high_id, low_wins, high_wins, ties, last_played_at)
+    SELECT LEAST(m.winner_id, m.loser_id), GREATEST(m.winner_id, m.loser_id),
+           COUNT(*) FILTER (WHERE NOT m.is_tie AND m.winner_id < m.loser_id),
+           COUNT(*) FILTER (WHERE NOT m.is_tie AND m.winner_id > m.loser_id),
+           COUNT(*) FILTER (WHERE m.is_tie),
+           MAX(m.timestamp)
+    FROM matches m
+    JOIN brands w ON w.id = m.winner_id
+    JOIN brands l ON l.id = m.loser_id
+    WHERE m.winner_id <> m.loser_id
+    GROUP BY 1, 2
+"""
+
+
+def record_head_to_head(
+    session: Session, results: Iterable[tuple[uuid.UUID, uuid.UUID, bool, datetime]]
+) -> None:
+    """
+    Adds (winner_id, loser_id, is_tie, played_at) results to head_to_head
+    with a single INSERT ... ON CONFLICT DO UPDATE, one row per pair.
+    Rows are written in key order so concurrent writers can't deadlock.
+    Added to the caller's transaction; the caller commits.
+    """
+    totals: dict[tuple[uuid.UUID, uuid.UUID], list] = {}
+    for winner_id, loser_id, is_tie, played_at in results:
+        low, high = sorted((winner_id, loser_id))
+        row = totals.setdefault((low, high), [0, 0, 0, played_at])
+        if is_tie:
+            row[2] += 1
+        elif winner_id == low:
+            row[0] += 1
+        else:
+            row[1] += 1
+        row[3] = max(row[3], played_at)
+    if not totals:
+        return
+
+    statement = insert(HeadToHead).values([
+        {
+            "brand_low_id": low, "brand_high_id": high,
+            "low_wins": low_wins, "high_wins": high_wins, "ties": ties, "last_played_at": played_at,
+        }
+        for (low, high), (low_wins, high_wins, ties, played_at) in sorted(totals.items())
+    ])
+    session.exec(statement.on_conflict_do_update(
+        index_elements=[HeadToHead.brand_low_id, HeadToHead.brand_high_id],
+        set_={
+            "low_wins": HeadToHead.low_wins + statement.excluded.low_wins,
+            "high_wins": HeadToHead.high_wins + statement.excluded.high_wins,
+            "ties": HeadToHead.ties + statement.excluded.ties,
+            "last_played_at": func.greatest(HeadToHead.last_played_at, statement.excluded.last_played_at),
+        },
+    ))
+
+
+def _rival_order(table) -> tuple:
+    """Most games, then most recently played; matches the rivals indexes."""
+    games = table.low_wins + table.high_wins + table.ties
+    return games.desc(), table.last_played_at.desc().nulls_last()
+
+
+def _from_side(record: HeadToHead, brand_id: uuid.UUID) -> HeadToHeadRead:
+    is_low = record.brand_low_id == brand_id
+    wins, losses = (record.low_wins, record.high_wins) if is_low else (record.high_wins, record.low_wins)
+    return HeadToHeadRead(
+        brand_id=brand_id,
+        opponent_id=record.brand_high_id if is_low else record.brand_low_id,
+        wins=wins,
+        losses=losses,
+        ties=record.ties,
+        games=wins + losses + record.ties,
+        last_played_at=record.last_played_at,
+    )
+
+
+class HeadToHeadService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_pair(self, brand_id: uuid.UUID, opponent_id: uuid.UUID) -> HeadToHeadRead:
+        """One primary-key lookup; pairs that never met come back as 0-0-0."""
+        if brand_id == opponent_id:
+            raise HTTPException(status_code=400, detail="Cannot compare a brand with itself")
+
+        names = dict(self.session.exec(
+            select(Brand.id, Brand.name).where(Brand.id.in_([brand_id, opponent_id]))
+        ).all())
+        if len(names) < 2:
+            raise HTTPException(status_code=404, detail="Brand not found")
+
+        low, high = sorted((brand_id, opponent_id))
+        record = self.session.get(HeadToHead, (low, high))
+        result = (
+            _from_side(record, brand_id) if record
+            else HeadToHeadRead(brand_id=brand_id, opponent_id=opponent_id)
+        )
+        result.opponent_name = names[opponent_id]
+        return result
+
+    def get_rivals(self, brand_id: uuid.UUID, limit: int = 10) -> list[HeadToHeadRead]:
+        """The brand's most-played opponents, most games (then most recent) first."""
+        if not self.session.get(Brand, brand_id):
+            raise HTTPException(status_code=404, detail="Brand not found")
+
+        # Each side reads at most `limit` rows off its (brand, games, last played)
+        # index; the two short lists are then merged in the same order
+        sides = union_all(*(
+            select(HeadToHead).where(column == brand_id).order_by(*_rival_order(HeadToHead)).limit(limit)
+            for column in (HeadToHead.brand_low_id, HeadToHead.brand_high_id)
+        )).subquery()
+        pairs = aliased(HeadToHead, sides)
+        records = self.session.exec(
+            select(pairs).order_by(*_rival_order(pairs)).limit(limit)
+        ).all()
+        rivals = [_from_side(record, brand_id) for record in records]
+
+        opponent_ids = [r.opponent_id for r in rivals]
+        names = dict(self.session.exec(
+            select(Brand.id, Brand.name).where(Brand.id.in_(opponent_ids))
+        ).all()) if opponent_ids else {}
+        for rival in rivals:
+            rival.opponent_name = names.get(rival.opponent_id)
+        return rivals
+
+    def rebuild(self) -> int:
+        """
+        Recomputes head_to_head from the match log. Votes upserting into the
+        table wait until the caller's transaction ends. Returns pairs written.
+        """
+        self.session.exec(text("LOCK TABLE head_to_head IN EXCLUSIVE MODE"))
+        self.session.exec(delete(HeadToHead))
+        return self.session.connection().execute(text(_BACKFILL)).rowcount
@@ -1,17 +1,183 @@
-from sqlmodel import Session
+import asyncio
+import uuid
+from datetime import datetime
+from sqlalchemy import tuple_, union_all
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException
 from app.models.brand import Brand
 from app.models.match import Match
+from app.core.config import settings
 from app.core.elo import calculate_new_ratings, get_tier_from_elo 
-from app.schemas.match import MatchCreate, MatchResult
+from app.core import indexes
+from app.core.metrics import OPERATION_SECONDS, VOTES_RECORDED, timed
+from app.schemas.match import MatchCreate, MatchHistoryEntry, MatchResult
+from app.services.activity import record_activity
+from app.services.head_to_head import record_head_to_head
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.regional_ratings import apply_regional_vote, lock_regional_ratings
 
 class MatchService:
     def __init__(self, session: Session):
         self.session = session
 
     def record_match(self, match_data: MatchCreate) -> MatchResult:
-        brand_a = self.session.get(Brand, match_data.winner_id)
-        brand_b = self.session.get(Brand, match_data.loser_id)
+        if settings.VOTE_BATCHING_ENABLED:
+            # Imported here: the queue itself builds MatchServices
+            from app.services.vote_queue import vote_queue
+            return vote_queue.submit(match_data).result()
+
+        result = self.record_votes([match_data])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def record_matches(self, votes: list[MatchCreate]) -> list[MatchResult]:
+        """
+        Records an ordered batch of votes all-or-nothing: one brand query,
+        Elo applied in order in memory, one commit. Any invalid vote rejects
+        the whole batch.
+        """
+        if len(votes) > settings.MATCH_BATCH_MAX_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {settings.MATCH_BATCH_MAX_SIZE} matches per batch",
+            )
+        return self.record_votes(votes, atomic=True)
+
+    @timed("matches.record_votes")
+    def record_votes(
+        self, votes: list[MatchCreate], atomic: bool = False
+    ) -> list[MatchResult | HTTPException]:
+        """
+        Applies votes in order inside one transaction, together with their
+        head-to-head totals, hourly activity rollups and, for votes with a
+        location_country, that region's ratings. Every involved brand row is locked (SELECT ...
+        FOR UPDATE, ordered by id) before any rating is read, so concurrent
+        writers serialize instead of losing updates.
+        A vote naming a missing brand gets an HTTPException in its slot
+        without affecting the others, unless `atomic`, in which case the
+        transaction is rolled back and the error raised.
+        """
+        if not votes:
+            return []
+
+        brand_ids = {v.winner_id for v in votes} | {v.loser_id for v in votes}
+        brands = self._lock_brands(brand_ids)
+        regional = lock_regional_ratings(self.session, (
+            (vote.location_country, brand_id)
+            for vote in votes
+            if vote.location_country and vote.winner_id != vote.loser_id
+            and vote.winner_id in brands and vote.loser_id in brands
+            for brand_id in (vote.winner_id, vote.loser_id)
+        ))
+
+        results: list[MatchResult | HTTPException] = []
+        applied = []
+        for vote in votes:
+            try:
+                result, match_history = self._apply_vote(brands, vote)
+            except HTTPException as exc:
+                if atomic:
+                    self.session.rollback()
+                    raise HTTPException(
+                        status_code=exc.status_code, detail=f"Match {len(results)}: {exc.detail}"
+                    )
+                results.append(exc)
+                continue
+            if vote.location_country:
+                apply_regional_vote(regional, vote.location_country, vote.winner_id, vote.loser_id, vote.is_tie)
+            results.append(result)
+            # Plain values: the Match's attributes expire on commit
+            applied.append((
+                match_history.winner_id, match_history.winner_elo_before, match_history.winner_elo_after,
+                match_history.loser_id, match_history.loser_elo_before, match_history.loser_elo_after,
+                match_history.is_tie, match_history.timestamp,
+            ))
+
+        record_head_to_head(
+            self.session, ((w, l, is_tie, played_at) for w, _, _, l, _, _, is_tie, played_at in applied)
+        )
+        record_activity(self.session, applied)
+        self.session.commit()
+
+        for *ratings, is_tie, _ in applied:
+            indexes.match_recorded(*ratings)
+            VOTES_RECORDED.labels("tie" if is_tie else "win").inc()
+        return results
+
+    def get_brand_matches(
+        self, brand_id: uuid.UUID, limit: int = 20, cursor: str | None = None
+    ) -> tuple[list[MatchHistoryEntry], str | None]:
+        """
+        A brand's matches, newest first. Returns (page, next_cursor); the
+        cursor continues by keyset on (timestamp, id). Each side (as winner,
+        as loser) is a range scan on its covering index, merged with UNION ALL.
+        """
+        if not self.session.get(Brand, brand_id):
+            raise HTTPException(status_code=404, detail="Brand not found")
+
+        after = None
+        if cursor:
+            position = decode_cursor(cursor)
+            try:
+                after = (datetime.fromisoformat(position["ts"]), uuid.UUID(str(position["id"])))
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        sides = []
+        for column in (Match.winner_id, Match.loser_id):
+            side = select(
+                Match.id, Match.timestamp, Match.winner_id, Match.loser_id,
+                Match.winner_elo_before, Match.winner_elo_after,
+                Match.loser_elo_before, Match.loser_elo_after, Match.is_tie,
+            ).where(column == brand_id)
+            if after is not None:
+                side = side.where(tuple_(Match.timestamp, Match.id) < tuple_(*after))
+            sides.append(side.order_by(Match.timestamp.desc(), Match.id.desc()).limit(limit))
+
+        merged = union_all(*sides).subquery()
+        rows = self.session.exec(
+            select(merged).order_by(merged.c.timestamp.desc(), merged.c.id.desc()).limit(limit)
+        ).all()
+
+        opponent_ids = {row.loser_id if row.winner_id == brand_id else row.winner_id for row in rows}
+        names = dict(
+            self.session.exec(select(Brand.id, Brand.name).where(Brand.id.in_(opponent_ids))).all()
+        ) if opponent_ids else {}
+
+        entries = []
+        for row in rows:
+            won = row.winner_id == brand_id
+            entries.append(MatchHistoryEntry(
+                id=row.id,
+                timestamp=row.timestamp,
+                outcome="tie" if row.is_tie else ("win" if won else "loss"),
+                elo_before=row.winner_elo_before if won else row.loser_elo_before,
+                elo_after=row.winner_elo_after if won else row.loser_elo_after,
+                opponent_id=row.loser_id if won else row.winner_id,
+                opponent_name=names.get(row.loser_id if won else row.winner_id),
+                opponent_elo_before=row.loser_elo_before if won else row.winner_elo_before,
+                opponent_elo_after=row.loser_elo_after if won else row.winner_elo_after,
+            ))
+
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = encode_cursor({"ts": rows[-1].timestamp.isoformat(), "id": rows[-1].id})
+        return entries, next_cursor
+
+    def _lock_brands(self, brand_ids: set[uuid.UUID]) -> dict[uuid.UUID, Brand]:
+        statement = (
+            select(Brand)
+            .where(Brand.id.in_(brand_ids))
+            .order_by(Brand.id)
+            .with_for_update()
+        )
+        return {b.id: b for b in self.session.exec(statement).all()}
+
+    def _apply_vote(self, brands: dict[uuid.UUID, Brand], match_data: MatchCreate) -> tuple[MatchResult, Match]:
+        brand_a = brands.get(match_data.winner_id)
+        brand_b = brands.get(match_data.loser_id)
 
         if not brand_a or not brand_b:
             raise HTTPException(status_code=404, detail="Brand not found")
@@ -24,11 +190,12 @@ class MatchService:
         matches_b = brand_b.wins + brand_b.losses + brand_b.ties
 
         # 2. Perform Rigorous Calculation
-        new_elo_a, new_elo_b = calculate_new_ratings(
-            rating_a=brand_a.elo, matches_a=matches_a,
-            rating_b=brand_b.elo, matches_b=matches_b,
-            is_tie=match_data.is_tie
-        )
+        with OPERATION_SECONDS.labels("elo.calculate_new_ratings").time():
+            new_elo_a, new_elo_b = calculate_new_ratings(
+                rating_a=brand_a.elo, matches_a=matches_a,
+                rating_b=brand_b.elo, matches_b=matches_b,
+                is_tie=match_data.is_tie
+            )
 
         # 3. Deltas
         diff_a = new_elo_a - brand_a.elo
@@ -64,13 +231,32 @@ class MatchService:
 
         self.session.add(brand_a)
         self.session.add(brand_b)
-        self.session.commit()
         
-        return MatchResult(
+        result = MatchResult(
             winner_id=brand_a.id,
-            winner_new_elo=brand_a.elo,
+            winner_new_elo=new_elo_a,
             winner_elo_change=diff_a,
             loser_id=brand_b.id,
-            loser_new_elo=brand_b.elo,
+            loser_new_elo=new_elo_b,
             loser_elo_change=diff_b
-        )
\ No newline at end of file
+        )
+        return result, match_history
+
+
+class AsyncMatchService:
+    """Async facade over MatchService (see AsyncBrandService)."""
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record_match(self, match_data: MatchCreate) -> MatchResult:
+        if settings.VOTE_BATCHING_ENABLED:
+            from app.services.vote_queue import vote_queue
+            return await asyncio.wrap_future(vote_queue.submit(match_data))
+
+        result = (await self.session.run_sync(lambda s: MatchService(s).record_votes([match_data])))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def record_matches(self, votes: list[MatchCreate]) -> list[MatchResult]:
+        return await self.session.run_sync(lambda s: MatchService(s).record_matches(votes))
@@ -0,0 +1,49 @@
+import uuid
+from typing import Sequence
+
+from sqlmodel import Session, select, func
+
+from app.core.config import settings
+from app.core.rank_index import rank_index
+from app.models.brand import Brand
+from app.schemas.brand import BrandRead
+
+
+def fetch_ranks(session: Session, brand_ids: Sequence[uuid.UUID]) -> dict[uuid.UUID, int]:
+    """
+    Computes the Global Rank of every requested brand in one statement using
+    RANK() OVER (ORDER BY elo DESC), which equals 1 + number of higher ELOs.
+    """
+    if not brand_ids:
+        return {}
+
+    ranked = select(
+        Brand.id,
+        func.rank().over(order_by=Brand.elo.desc()).label("rank"),
+    ).subquery()
+
+    rows = session.exec(
+        select(ranked.c.id, ranked.c.rank).where(ranked.c.id.in_(list(brand_ids)))
+    ).all()
+    return {brand_id: rank for brand_id, rank in rows}
+
+
+def populate_ranks(session: Session, brands: Sequence[Brand]) -> list[BrandRead]:
+    """
+    Converts DB brands to Read Schemas with their Global Rank attached.
+    Shared by every list-returning endpoint so a page costs at most one query.
+    """
+    results = [BrandRead.model_validate(b) for b in brands]
+    if not results:
+        return results
+
+    if settings.RANK_INDEX_ENABLED:
+        rank_index.ensure_fresh(session)
+        for brand_read in results:
+            brand_read.rank = rank_index.rank(brand_read.elo)
+    else:
+        ranks = fetch_ranks(session, [b.id for b in results])
+        for brand_read in results:
+            brand_read.rank = ranks.get(brand_read.id)
+
+    return results
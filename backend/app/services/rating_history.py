@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+# elo_trend / rank_trend measure the change over this window
+TREND_WINDOW = timedelta(hours=24)
+# Snapshots younger than this keep every row; older ones keep one per brand per day
+FULL_RESOLUTION_DAYS = 7
+
+# Every brand's current Elo and global rank (1 + number of higher Elos)
+_CURRENT = """
+    current AS (
+        SELECT id, elo, RANK() OVER (ORDER BY elo DESC) AS rank
+        FROM brands
+    )
+"""
+
+# Latest snapshot at or before :as_of per brand; one primary-key lookup each
+_LATEST_SNAPSHOT = """
+    LEFT JOIN LATERAL (
+        SELECT s.elo, s.rank
+        FROM rating_snapshots s
+        WHERE s.brand_id = c.id AND s.taken_at <= :as_of
+        ORDER BY s.taken_at DESC
+        LIMIT 1
+    ) l ON true
+"""
+
+_INSERT_CHANGED = f"""
+    WITH {_CURRENT}
+    INSERT INTO rating_snapshots (brand_id, taken_at, elo, rank)
+    SELECT c.id, :taken_at, c.elo, c.rank
+    FROM current c
+    {_LATEST_SNAPSHOT}
+    WHERE l.elo IS NULL OR l.elo <> c.elo OR l.rank <> c.rank
+"""
+
+_UPDATE_TRENDS = f"""
+    WITH {_CURRENT},
+    trends AS (
+        SELECT c.id,
+               COALESCE(c.elo - l.elo, 0) AS elo_trend,
+               COALESCE(l.rank - c.rank, 0) AS rank_trend
+        FROM current c
+        {_LATEST_SNAPSHOT}
+    )
+    UPDATE brands b
+    SET elo_trend = t.elo_trend, rank_trend = t.rank_trend
+    FROM trends t
+    WHERE b.id = t.id
+      AND (b.elo_trend <> t.elo_trend OR b.rank_trend <> t.rank_trend)
+"""
+
+# Before :cutoff keep only the last snapshot of each brand's day
+_COMPACT = """
+    DELETE FROM rating_snapshots s
+    USING (
+        SELECT brand_id, taken_at,
+               ROW_NUMBER() OVER (
+                   PARTITION BY brand_id, date_trunc('day', taken_at)
+                   ORDER BY taken_at DESC
+               ) AS position
+        FROM rating_snapshots
+        WHERE taken_at < :cutoff
+    ) d
+    WHERE s.brand_id = d.brand_id AND s.taken_at = d.taken_at AND d.position > 1
+"""
+
+
+class RatingHistoryService:
+    """
+    Maintains the rating_snapshots history and the trend fields derived from
+    it. Meant to run on a schedule (scripts/snapshot_ratings.py); everything
+    runs in the caller's transaction and the caller commits.
+    """
+    def __init__(self, session: Session):
+        self.session = session
+
+    def snapshot(self, taken_at: datetime | None = None) -> int:
+        """
+        Records the Elo and rank of every brand whose values changed since
+        its latest snapshot. Returns the number of rows written.
+        """
+        taken_at = taken_at or datetime.utcnow()
+        result = self.session.connection().execute(
+            text(_INSERT_CHANGED), {"taken_at": taken_at, "as_of": taken_at}
+        )
+        return result.rowcount
+
+    def update_trends(self, now: datetime | None = None, window: timedelta = TREND_WINDOW) -> int:
+        """
+        Sets elo_trend (Elo gained) and rank_trend (places climbed) against
+        each brand's state `window` ago, read from its snapshot at that time.
+        Only brands whose trend changed are written; returns how many.
+        Brands with no snapshot that old get 0.
+        """
+        now = now or datetime.utcnow()
+        result = self.session.connection().execute(
+            text(_UPDATE_TRENDS), {"as_of": now - window}
+        )
+        return result.rowcount
+
+    def compact(self, now: datetime | None = None, full_resolution_days: int = FULL_RESOLUTION_DAYS) -> int:
+        """Downsamples snapshots older than `full_resolution_days` to one per day. Returns rows deleted."""
+        now = now or datetime.utcnow()
+        result = self.session.connection().execute(
+            text(_COMPACT), {"cutoff": now - timedelta(days=full_resolution_days)}
+        )
+        return result.rowcount
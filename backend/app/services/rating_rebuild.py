@@ -0,0 +1,187 @@
+import uuid
+from typing import Iterator
+
+import numpy as np
+from sqlalchemy import delete, insert, text, update
+from sqlmodel import Session, select
+
+from app.core.bradley_terry import fit_bradley_terry, ratings_to_strengths, strengths_to_ratings
+from app.core.replay import EloReplay
+from app.models.brand import Brand
+from app.models.match import Match
+from app.models.regional_rating import RegionalRating
+
+# Matches fetched per round trip from the server-side cursor
+CHUNK_SIZE = 100_000
+
+
+class RatingRebuildService:
+    """
+    Recomputes brand ratings from the matches table. Everything runs in the
+    caller's transaction; the caller commits.
+    """
+    def __init__(self, session: Session):
+        self.session = session
+
+    def lock_brands(self) -> None:
+        """Blocks votes (row locks and updates on brands) until the transaction ends."""
+        self.session.exec(text("LOCK TABLE brands IN EXCLUSIVE MODE"))
+
+    def brand_ids(self) -> list[uuid.UUID]:
+        return list(self.session.exec(select(Brand.id).order_by(Brand.id)).all())
+
+    def stream_matches(
+        self, positions: dict[uuid.UUID, int], chunk_size: int = CHUNK_SIZE,
+        regions: dict[str, int] | None = None,
+    ) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Yields (winner positions, loser positions, tie flags) in timestamp
+        order, read through a server-side cursor. Matches involving deleted
+        brands, or a brand against itself, are skipped.
+
+        With `regions` (region -> index), only matches with a location_country
+        are read and a brand's position in region r becomes
+        r * len(positions) + its position, so each region rates separately.
+        """
+        columns = [Match.winner_id, Match.loser_id, Match.is_tie]
+        if regions is not None:
+            columns.append(Match.location_country)
+        statement = select(*columns).order_by(Match.timestamp, Match.id)
+        if regions is not None:
+            statement = statement.where(Match.location_country.is_not(None))
+        result = (
+            self.session.connection()
+            .execution_options(stream_results=True, yield_per=chunk_size)
+            .execute(statement)
+        )
+        n = len(positions)
+        for rows in result.partitions():
+            winners, losers, ties = [], [], []
+            for winner_id, loser_id, is_tie, *region in rows:
+                a = positions.get(winner_id)
+                b = positions.get(loser_id)
+                if a is None or b is None or a == b:
+                    continue
+                if regions is not None:
+                    offset = regions[region[0]] * n
+                    a, b = a + offset, b + offset
+                winners.append(a)
+                losers.append(b)
+                ties.append(is_tie)
+            yield (
+                np.array(winners, dtype=np.int64),
+                np.array(losers, dtype=np.int64),
+                np.array(ties, dtype=bool),
+            )
+
+    def replay_elo(self, initial_elo: int = 1200, chunk_size: int = CHUNK_SIZE) -> tuple[list[uuid.UUID], EloReplay]:
+        brand_ids = self.brand_ids()
+        positions = {brand_id: i for i, brand_id in enumerate(brand_ids)}
+
+        replay = EloReplay(len(brand_ids), initial_elo=initial_elo)
+        for winners, losers, ties in self.stream_matches(positions, chunk_size):
+            replay.apply(winners, losers, ties)
+        return brand_ids, replay
+
+    def write_elo(self, brand_ids: list[uuid.UUID], replay: EloReplay) -> None:
+        """Bulk UPDATE of elo, tier and record for every brand, by primary key."""
+        tiers = replay.tiers()
+        rows = [
+            {
+                "id": brand_id,
+                "elo": int(replay.elo[i]),
+                "tier": tiers[i],
+                "wins": int(replay.wins[i]),
+                "losses": int(replay.losses[i]),
+                "ties": int(replay.ties[i]),
+            }
+            for i, brand_id in enumerate(brand_ids)
+        ]
+        if rows:
+            self.session.execute(update(Brand), rows)
+
+    def fit_bradley_terry(self, warm_start: bool = True, chunk_size: int = CHUNK_SIZE) -> tuple[list[uuid.UUID], np.ndarray, int]:
+        """
+        Fits Bradley-Terry ratings (Elo scale) over the whole match history,
+        which unlike sequential Elo doesn't depend on vote order. With
+        `warm_start`, iteration starts from the currently published bt_rating.
+        Returns (brand ids, ratings, iterations).
+        """
+        rows = self.session.exec(select(Brand.id, Brand.bt_rating).order_by(Brand.id)).all()
+        brand_ids = [brand_id for brand_id, _ in rows]
+        positions = {brand_id: i for i, brand_id in enumerate(brand_ids)}
+        n = len(brand_ids)
+        if n == 0:
+            return brand_ids, np.zeros(0), 0
+
+        # Aggregate the history into games per unordered pair and score per brand
+        wins = np.zeros(n)
+        pair_keys = []
+        for winners, losers, ties in self.stream_matches(positions, chunk_size):
+            decisive = ~ties
+            wins += np.bincount(winners[decisive], minlength=n)
+            wins += 0.5 * np.bincount(winners[ties], minlength=n)
+            wins += 0.5 * np.bincount(losers[ties], minlength=n)
+            pair_keys.append(np.minimum(winners, losers) * n + np.maximum(winners, losers))
+
+        keys, games = np.unique(np.concatenate(pair_keys) if pair_keys else np.zeros(0, dtype=np.int64), return_counts=True)
+
+        initial = None
+        if warm_start:
+            previous = np.array([rating if rating is not None else np.nan for _, rating in rows], dtype=np.float64)
+            if not np.isnan(previous).all():
+                initial = ratings_to_strengths(np.nan_to_num(previous, nan=np.nanmean(previous)))
+
+        strengths, iterations = fit_bradley_terry(
+            keys // n, keys % n, games.astype(np.float64), wins, initial=initial
+        )
+        return brand_ids, strengths_to_ratings(strengths), iterations
+
+    def write_bt(self, brand_ids: list[uuid.UUID], ratings: np.ndarray) -> None:
+        rows = [
+            {"id": brand_id, "bt_rating": round(float(ratings[i]), 2)}
+            for i, brand_id in enumerate(brand_ids)
+        ]
+        if rows:
+            self.session.execute(update(Brand), rows)
+
+    def replay_regional(
+        self, initial_elo: int = 1200, chunk_size: int = CHUNK_SIZE
+    ) -> tuple[list[uuid.UUID], list[str], EloReplay]:
+        """
+        Replays every region's votes (by location_country) as an independent
+        Elo history in one pass; see stream_matches for the position layout.
+        """
+        brand_ids = self.brand_ids()
+        positions = {brand_id: i for i, brand_id in enumerate(brand_ids)}
+        regions = sorted(self.session.exec(
+            select(Match.location_country).where(Match.location_country.is_not(None)).distinct()
+        ).all())
+
+        replay = EloReplay(len(regions) * len(brand_ids), initial_elo=initial_elo)
+        region_index = {region: i for i, region in enumerate(regions)}
+        for winners, losers, ties in self.stream_matches(positions, chunk_size, regions=region_index):
+            replay.apply(winners, losers, ties)
+        return brand_ids, regions, replay
+
+    def write_regional(self, brand_ids: list[uuid.UUID], regions: list[str], replay: EloReplay) -> int:
+        """Replaces regional_ratings with the replayed rows; brands that never played in a region get none."""
+        self.session.exec(delete(RegionalRating))
+        tiers = replay.tiers()
+        played = np.flatnonzero(replay.wins + replay.losses + replay.ties)
+        n = len(brand_ids)
+        rows = [
+            {
+                "region": regions[p // n],
+                "brand_id": brand_ids[p % n],
+                "elo": int(replay.elo[p]),
+                "tier": tiers[p],
+                "wins": int(replay.wins[p]),
+                "losses": int(replay.losses[p]),
+                "ties": int(replay.ties[p]),
+            }
+            for p in played.tolist()
+        ]
+        if rows:
+            self.session.execute(insert(RegionalRating), rows)
+        return len(rows)
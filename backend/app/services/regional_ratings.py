@@ -0,0 +1,72 @@
+import uuid
+from typing import Iterable
+
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.core.elo import calculate_new_ratings, get_tier_from_elo
+from app.core.metrics import OPERATION_SECONDS
+from app.models.regional_rating import RegionalRating
+
+# Same starting point as a new brand's global rating
+INITIAL_ELO = 1200
+
+
+def lock_regional_ratings(
+    session: Session, keys: Iterable[tuple[str, uuid.UUID]]
+) -> dict[tuple[str, uuid.UUID], RegionalRating]:
+    """
+    Returns the (region, brand_id) rows, creating missing ones at the
+    initial rating, locked FOR UPDATE in key order. Callers lock the brands
+    first, so these row locks never wait on a differently ordered writer.
+    Added to the caller's transaction; the caller commits.
+    """
+    ordered = sorted(set(keys))
+    if not ordered:
+        return {}
+
+    session.exec(
+        insert(RegionalRating)
+        .values([
+            {"region": region, "brand_id": brand_id, "elo": INITIAL_ELO, "tier": "Unranked",
+             "wins": 0, "losses": 0, "ties": 0}
+            for region, brand_id in ordered
+        ])
+        .on_conflict_do_nothing(index_elements=[RegionalRating.region, RegionalRating.brand_id])
+    )
+    statement = (
+        select(RegionalRating)
+        .where(tuple_(RegionalRating.region, RegionalRating.brand_id).in_(ordered))
+        .order_by(RegionalRating.region, RegionalRating.brand_id)
+        .with_for_update()
+    )
+    return {(r.region, r.brand_id): r for r in session.exec(statement).all()}
+
+
+def apply_regional_vote(
+    ratings: dict[tuple[str, uuid.UUID], RegionalRating],
+    region: str, winner_id: uuid.UUID, loser_id: uuid.UUID, is_tie: bool,
+) -> None:
+    """Applies one vote to the region's ratings with the global Elo rules."""
+    rating_a = ratings[(region, winner_id)]
+    rating_b = ratings[(region, loser_id)]
+
+    with OPERATION_SECONDS.labels("elo.calculate_new_ratings").time():
+        new_elo_a, new_elo_b = calculate_new_ratings(
+            rating_a=rating_a.elo, matches_a=rating_a.wins + rating_a.losses + rating_a.ties,
+            rating_b=rating_b.elo, matches_b=rating_b.wins + rating_b.losses + rating_b.ties,
+            is_tie=is_tie,
+        )
+
+    rating_a.elo = new_elo_a
+    rating_a.tier = get_tier_from_elo(new_elo_a)
+    rating_b.elo = new_elo_b
+    rating_b.tier = get_tier_from_elo(new_elo_b)
+
+    if is_tie:
+        rating_a.ties += 1
+        rating_b.ties += 1
+    else:
+        rating_a.wins += 1
+        rating_b.losses += 1
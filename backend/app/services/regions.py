@@ -0,0 +1,43 @@
+import uuid
+from typing import Iterable
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.models.brand import Brand
+from app.models.brand_region import BrandRegion, GLOBAL_REGION
+
+
+def set_brand_regions(session: Session, brand_id: uuid.UUID, regions: Iterable[str]) -> None:
+    """
+    Replaces a brand's rows in brand_regions to mirror `regions_present`.
+    Added to the caller's transaction; the caller commits.
+    """
+    session.exec(delete(BrandRegion).where(BrandRegion.brand_id == brand_id))
+    session.add_all(
+        BrandRegion(brand_id=brand_id, region=region) for region in set(regions or [])
+    )
+
+
+def add_brand_region(session: Session, brand_id: uuid.UUID, region: str) -> None:
+    """
+    Adds one (brand, region) row, doing nothing if a concurrent request got
+    there first. Autoflush writes a brand added earlier in the session before
+    this runs. Added to the caller's transaction; the caller commits.
+    """
+    session.exec(
+        insert(BrandRegion)
+        .values(brand_id=brand_id, region=region)
+        .on_conflict_do_nothing(index_elements=[BrandRegion.brand_id, BrandRegion.region])
+    )
+
+
+def in_region(country_code: str):
+    """
+    WHERE clause for brands present in `country_code` (or tagged "Global"),
+    answered from the brand_regions index.
+    """
+    return Brand.id.in_(
+        select(BrandRegion.brand_id).where(BrandRegion.region.in_([country_code, GLOBAL_REGION]))
+    )
@@ -0,0 +1,81 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.metrics import VOTE_BATCH_SIZE
+from app.db.session import engine
+from app.schemas.match import MatchCreate, MatchResult
+from app.services.match_service import MatchService
+
+logger = logging.getLogger(__name__)
+
+
+class VoteQueue:
+    """
+    Single-writer vote ingestion for this worker process.
+
+    Votes are queued in arrival order. One background thread drains up to
+    VOTE_BATCH_MAX_SIZE of them (waiting at most VOTE_BATCH_MAX_WAIT_MS for
+    more) and records each group in a single transaction, so every vote sees
+    the ratings left by the one before it. Row locks taken by
+    MatchService.record_votes keep this safe across worker processes.
+    """
+
+    def __init__(self):
+        self._queue: queue.Queue[tuple[MatchCreate, Future]] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, match_data: MatchCreate) -> "Future[MatchResult]":
+        self._ensure_started()
+        future: Future[MatchResult] = Future()
+        self._queue.put((match_data, future))
+        return future
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="vote-writer", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> list[tuple[MatchCreate, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + settings.VOTE_BATCH_MAX_WAIT_MS / 1000
+        while len(batch) < settings.VOTE_BATCH_MAX_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            VOTE_BATCH_SIZE.observe(len(batch))
+            try:
+                with Session(engine) as session:
+                    results = MatchService(session).record_votes([vote for vote, _ in batch])
+            except Exception as exc:
+                logger.exception("Failed to record a batch of %d votes", len(batch))
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+vote_queue = VoteQueue()
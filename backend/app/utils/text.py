@@ -1,22 +1,54 @@
-import spacy
 from cleanco import basename
 import re
+import threading
+from collections import OrderedDict
 
-# Load NLP model once (Global variable to avoid reloading)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("⚠️ Spacy model not found. Run: python -m spacy download en_core_web_sm")
-    nlp = None
+from app.core.metrics import timed
 
-def clean_brand_name(raw_name: str, google_types: list[str] = None) -> str:
+# Only the NER component is read below; en_core_web_sm's NER has its own
+# tok2vec layer, so the rest of the pipeline can be left out entirely.
+UNUSED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+# Upper bound on memoized (raw_name, types) -> cleaned name entries
+CLEAN_CACHE_SIZE = 4096
+
+# Loaded on first use (or by the startup warm-up) so importing this module stays cheap
+_nlp = None
+_nlp_loaded = False
+_nlp_lock = threading.Lock()
+
+_clean_cache: OrderedDict[tuple[str, tuple[str, ...]], str] = OrderedDict()
+_clean_cache_lock = threading.Lock()
+
+
+def get_nlp():
     """
-    Cleans a raw store name using Legal Entity detection + Google Metadata + NLP.
-    Example: "Chatime Canada Ltd. | Waterloo" -> "Chatime"
+    Returns the shared spaCy pipeline, loading it on first call.
+    Returns None if the model isn't installed.
     """
-    if google_types is None:
-        google_types = []
+    global _nlp, _nlp_loaded
+    if _nlp_loaded:
+        return _nlp
 
+    with _nlp_lock:
+        if not _nlp_loaded:
+            import spacy
+
+            try:
+                _nlp = spacy.load("en_core_web_sm", exclude=UNUSED_PIPES)
+            except OSError:
+                print("⚠️ Spacy model not found. Run: python -m spacy download en_core_web_sm")
+                _nlp = None
+            _nlp_loaded = True
+
+    return _nlp
+
+
+def is_nlp_loaded() -> bool:
+    return _nlp_loaded
+
+
+def _strip_legal_and_types(raw_name: str, google_types: list[str]) -> str:
     # 1. Clean Legal Entities (e.g., "Chatime Canada Ltd." -> "Chatime Canada")
     # cleanco handles "Ltd", "Inc", "GmbH", "S.A." etc.
     clean = basename(raw_name)
@@ -33,11 +65,14 @@ def clean_brand_name(raw_name: str, google_types: list[str] = None) -> str:
             clean = clean[:-(len(readable_type) + 1)].strip()
             lower_name = clean.lower()
 
+    return clean
+
+
+def _finalize(clean: str, doc) -> str:
     # 3. NLP Entity Recognition (The "AI" way)
     # Use Spacy to distinguish ORG (Organization) from GPE (Location)
     # e.g., "The Alley at Waterloo" -> "The Alley"
-    if nlp:
-        doc = nlp(clean)
+    if doc is not None:
         org_parts = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
         
         # If the NLP is confident it found an Organization name, prefer that.
@@ -49,4 +84,48 @@ def clean_brand_name(raw_name: str, google_types: list[str] = None) -> str:
     # "Chatime - University Ave" -> "Chatime"
     clean = re.split(r'[|\-–@]', clean)[0]
     
-    return clean.strip().title()
\ No newline at end of file
+    return clean.strip().title()
+
+
+@timed("text.clean_brand_names")
+def clean_brand_names(items: list[tuple[str, list[str] | None]]) -> list[str]:
+    """
+    Batch version of clean_brand_name for (raw_name, google_types) pairs.
+    Results are memoized, and every uncached name goes through a single
+    nlp.pipe call instead of one NLP run per name.
+    """
+    keys = [(raw_name, tuple(google_types or [])) for raw_name, google_types in items]
+
+    results: dict[tuple[str, tuple[str, ...]], str] = {}
+    with _clean_cache_lock:
+        for key in keys:
+            if key in _clean_cache:
+                _clean_cache.move_to_end(key)
+                results[key] = _clean_cache[key]
+
+    misses = [key for key in dict.fromkeys(keys) if key not in results]
+    if misses:
+        cleaned = [_strip_legal_and_types(raw_name, list(types)) for raw_name, types in misses]
+        nlp = get_nlp()
+        docs = nlp.pipe(cleaned) if nlp else [None] * len(cleaned)
+
+        for key, clean, doc in zip(misses, cleaned, docs):
+            results[key] = _finalize(clean, doc)
+
+        with _clean_cache_lock:
+            for key in misses:
+                _clean_cache[key] = results[key]
+                _clean_cache.move_to_end(key)
+            while len(_clean_cache) > CLEAN_CACHE_SIZE:
+                _clean_cache.popitem(last=False)
+
+    return [results[key] for key in keys]
+
+
+@timed("text.clean_brand_name")
+def clean_brand_name(raw_name: str, google_types: list[str] = None) -> str:
+    """
+    Cleans a raw store name using Legal Entity detection + Google Metadata + NLP.
+    Example: "Chatime Canada Ltd. | Waterloo" -> "Chatime"
+    """
+    return clean_brand_names([(raw_name, google_types)])[0]
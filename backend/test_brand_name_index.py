@@ -0,0 +1,161 @@
+"""
+Offline checks that BrandNameIndex.best_match makes the same decisions as a
+brute-force extractOne over the whole catalogue. No database needed.
+
+    python test_brand_name_index.py   (or: pytest test_brand_name_index.py)
+"""
+import os
+import random
+import uuid
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/teaelo")
+
+from rapidfuzz import fuzz, process  # noqa: E402
+from thefuzz import utils as fuzz_utils  # noqa: E402
+
+from app.core.brand_name_index import MATCH_THRESHOLD, BrandNameIndex  # noqa: E402
+from app.core.fuzzy_bounds import WRatioBounds  # noqa: E402
+
+WORDS = [
+    "tea", "milk", "boba", "bubble", "house", "cafe", "chatime", "gong", "cha", "fruit",
+    "lab", "express", "fresh", "taro", "yi", "fang", "coco", "sharetea", "kung", "fu",
+    "the", "alley", "tiger", "sugar", "machi", "happy", "lemon", "royal", "tp", "co",
+]
+
+
+class StaticIndex(BrandNameIndex):
+    """BrandNameIndex loaded from a list of rows instead of the database."""
+
+    def _fetch(self, rows):
+        return rows
+
+
+def _random_word(rng: random.Random, low: int = 3, high: int = 7) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(low, high)))
+
+
+def _typo(rng: random.Random, name: str) -> str:
+    chars = list(name)
+    i = rng.randrange(len(chars))
+    roll = rng.random()
+    if roll < 0.33:
+        chars.insert(i, rng.choice("abcdefghij"))
+    elif roll < 0.66 and len(chars) > 1:
+        del chars[i]
+    else:
+        chars[i] = rng.choice("abcdefghij")
+    return "".join(chars)
+
+
+def _catalogue(rng: random.Random, size: int) -> list[str]:
+    """Many names sharing grams and whole words, like real tea shop names."""
+    names = ["Bubble Tea"] + [f"{_random_word(rng, 4, 7).title()} Bubble Tea" for _ in range(250)]
+    for _ in range(size):
+        name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        if rng.random() < 0.7:
+            name += " " + _random_word(rng)
+        names.append(name)
+    return names
+
+
+def _build(names: list[str]) -> tuple[StaticIndex, list[tuple[uuid.UUID, str, None]]]:
+    rows = [(uuid.uuid4(), name, None) for name in names]
+    index = StaticIndex()
+    index.rebuild(rows)
+    return index, rows
+
+
+def _brute_force_score(query: str, names: list[str]) -> int | None:
+    """What thefuzz.process.extractOne over every name decides, as a rounded score."""
+    result = process.extractOne(
+        fuzz_utils.full_process(query), [fuzz_utils.full_process(n) for n in names],
+        scorer=fuzz.WRatio, processor=None, score_cutoff=MATCH_THRESHOLD - 0.5,
+    )
+    return round(result[1]) if result and round(result[1]) >= MATCH_THRESHOLD else None
+
+
+def _decision(index: StaticIndex, names_by_id: dict[uuid.UUID, str], query: str) -> int | None:
+    brand_id = index.best_match(query)
+    if brand_id is None:
+        return None
+    return round(fuzz.WRatio(fuzz_utils.full_process(query), fuzz_utils.full_process(names_by_id[brand_id])))
+
+
+def test_bounds_never_undercut_wratio():
+    rng = random.Random(3)
+    alphabet = "aabbcde 1é-"
+
+    def text():
+        roll = rng.random()
+        if roll < 0.4:
+            return "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 14)))
+        words = " ".join(rng.choice(["tea", "te", "a", "bubble", "bub", "co", "x"]) for _ in range(rng.randint(1, 4)))
+        return words if roll < 0.8 else f"{words} - " + "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 40)))
+
+    names = [n for n in (fuzz_utils.full_process(text()) for _ in range(800)) if n]
+    bounds = WRatioBounds()
+    bounds.rebuild(enumerate(names))
+    for _ in range(100):
+        query = fuzz_utils.full_process(text())
+        if not query:
+            continue
+        upper = bounds.upper_bounds(query)
+        for position, name in enumerate(names):
+            score = fuzz.WRatio(query, name)
+            assert upper[position] >= score - 1e-9, (query, name, score, upper[position])
+    print(f"   ✅ bounds held for {len(names)} names x 100 queries")
+
+
+def test_same_decisions_as_brute_force():
+    rng = random.Random(11)
+    names = _catalogue(rng, 5000)
+    index, rows = _build(names)
+    names_by_id = {brand_id: name for brand_id, name, _ in rows}
+
+    queries = ["Bubble Tea Co", "Bubbl Tea", "Bubble Teaa", "tea", "boba", "tp", "Gong Cha"]
+    for _ in range(400):
+        name = rng.choice(names)
+        roll = rng.random()
+        if roll < 0.3:
+            queries.append(_typo(rng, name))
+        elif roll < 0.5:
+            queries.append(f"{name} {rng.choice(WORDS)}")
+        elif roll < 0.7:
+            queries.append(" ".join(name.split()[:-1]) or name)
+        elif roll < 0.85:
+            queries.append(_random_word(rng, 3, 12))
+        else:
+            queries.append(" ".join(rng.choice(WORDS) for _ in range(2)))
+
+    differences = [
+        (query, expected, actual)
+        for query in queries
+        if (expected := _brute_force_score(query, names)) != (actual := _decision(index, names_by_id, query))
+    ]
+    assert not differences, differences[:10]
+    print(f"   ✅ {len(queries)} lookups agree with extractOne over {len(names)} names")
+
+
+def test_bubble_tea_variants_find_bubble_tea():
+    rng = random.Random(5)
+    names = ["Bubble Tea"] + [f"{_random_word(rng, 4, 7).title()} Bubble Tea" for _ in range(250)]
+    index, rows = _build(names)
+    bubble_tea = rows[0][0]
+
+    for query in ["Bubble Tea Co", "Bubbl Tea", "Bubble Teaa"]:
+        assert index.best_match(query) == bubble_tea, query
+
+    # Still agrees with brute force after the index is patched
+    index.remove(bubble_tea)
+    remaining = names[1:]
+    names_by_id = {brand_id: name for brand_id, name, _ in rows[1:]}
+    for query in ["Bubble Tea Co", "Bubbl Tea", "Bubble Teaa"]:
+        assert _decision(index, names_by_id, query) == _brute_force_score(query, remaining), query
+    print("   ✅ misspelt and extended names resolve to Bubble Tea")
+
+
+if __name__ == "__main__":
+    print("\n🧋 BrandNameIndex.best_match against brute-force extractOne")
+    test_bounds_never_undercut_wratio()
+    test_same_decisions_as_brute_force()
+    test_bubble_tea_variants_find_bubble_tea()
@@ -0,0 +1,110 @@
+import sys
+import requests
+from datetime import datetime
+from itertools import groupby
+from concurrent.futures import ThreadPoolExecutor
+from sqlmodel import Session, select, func, or_
+from app.db.session import engine
+from app.models.brand import Brand
+from app.models.match import Match
+
+MATCH_URL = "http://127.0.0.1:8000/matches/"
+VOTES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+WORKERS = 32
+
+def snapshot(brand_ids):
+    with Session(engine) as session:
+        brands = {b.id: (b.wins, b.losses, b.ties, b.elo) for b in session.exec(
+            select(Brand).where(Brand.id.in_(brand_ids))
+        ).all()}
+        match_count = session.exec(
+            select(func.count()).select_from(Match).where(
+                or_(Match.winner_id.in_(brand_ids), Match.loser_id.in_(brand_ids))
+            )
+        ).one()
+        return brands, match_count
+
+def get_test_brands():
+    with Session(engine) as session:
+        brands = session.exec(select(Brand).limit(3)).all()
+        if len(brands) < 3:
+            print("❌ Error: Need at least 3 brands in the database to test.")
+            exit()
+        return [b.id for b in brands]
+
+def cast_vote(i, brand_ids):
+    # Rotate through the three pairings so every brand is contended
+    a, b = brand_ids[i % 3], brand_ids[(i + 1) % 3]
+    payload = {"winner_id": str(a), "loser_id": str(b), "is_tie": i % 10 == 0}
+    response = requests.post(MATCH_URL, json=payload)
+    response.raise_for_status()
+    return payload
+
+def test_concurrent_votes():
+    brand_ids = get_test_brands()
+    before, matches_before = snapshot(brand_ids)
+    started = datetime.utcnow()
+
+    print(f"\n🗳️  Casting {VOTES} votes from {WORKERS} threads on 3 brands...")
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        votes = list(pool.map(lambda i: cast_vote(i, brand_ids), range(VOTES)))
+
+    after, matches_after = snapshot(brand_ids)
+
+    ok = True
+    if matches_after - matches_before == VOTES:
+        print(f"   ✅ MATCHES: {VOTES} recorded")
+    else:
+        print(f"   ❌ FAIL: expected {VOTES} matches, got {matches_after - matches_before}")
+        ok = False
+
+    for brand_id in brand_ids:
+        expected_wins = sum(1 for v in votes if v["winner_id"] == str(brand_id) and not v["is_tie"])
+        expected_losses = sum(1 for v in votes if v["loser_id"] == str(brand_id) and not v["is_tie"])
+        expected_ties = sum(1 for v in votes if str(brand_id) in (v["winner_id"], v["loser_id"]) and v["is_tie"])
+        delta = tuple(a - b for a, b in zip(after[brand_id][:3], before[brand_id][:3]))
+        if delta == (expected_wins, expected_losses, expected_ties):
+            print(f"   ✅ COUNTERS {brand_id}: +{delta[0]}W +{delta[1]}L +{delta[2]}T")
+        else:
+            print(f"   ❌ FAIL {brand_id}: counters moved {delta}, expected {(expected_wins, expected_losses, expected_ties)}")
+            ok = False
+
+    # No lost updates: each brand's rating history must chain exactly.
+    # Votes in one micro-batch can share a timestamp and ids are random, so
+    # within a timestamp the next match is the one continuing the chain.
+    with Session(engine) as session:
+        for brand_id in brand_ids:
+            history = session.exec(
+                select(Match).where(
+                    or_(Match.winner_id == brand_id, Match.loser_id == brand_id),
+                    Match.timestamp >= started,
+                ).order_by(Match.timestamp, Match.id)
+            ).all()
+            elo = before[brand_id][3]
+            broken = False
+            for _, group in groupby(history, key=lambda m: m.timestamp):
+                steps = [
+                    (m.winner_elo_before, m.winner_elo_after) if m.winner_id == brand_id
+                    else (m.loser_elo_before, m.loser_elo_after)
+                    for m in group
+                ]
+                while steps:
+                    # Unchanged ratings first; they can't break the chain
+                    step = next((s for s in steps if s == (elo, elo)), None) \
+                        or next((s for s in steps if s[0] == elo), None)
+                    if step is None:
+                        print(f"   ❌ FAIL {brand_id}: history broken ({elo} -> {steps[0][0]})")
+                        ok, broken = False, True
+                        break
+                    steps.remove(step)
+                    elo = step[1]
+                if broken:
+                    break
+            if elo != after[brand_id][3]:
+                print(f"   ❌ FAIL {brand_id}: final ELO {after[brand_id][3]} doesn't match history ({elo})")
+                ok = False
+
+    print("   ✨ Success: no lost updates." if ok else "   ❌ Concurrency check failed.")
+
+if __name__ == "__main__":
+    test_concurrent_votes()
@@ -0,0 +1,64 @@
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = REPO_ROOT / "backend"
+
+# Load environment variables from backend/.env file
+env_path = BACKEND_DIR / ".env"
+if env_path.exists():
+    load_dotenv(env_path)
+
+sys.path.append(str(BACKEND_DIR))
+
+from app.db.database import session_scope  # noqa: E402
+from app.services.activity import HOURLY_RETENTION_DAYS, ActivityService  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Fold old hourly activity rollups into daily ones (run e.g. daily from cron), "
+        "or rebuild both from the matches table."
+    )
+    parser.add_argument(
+        "--hourly-days",
+        type=int,
+        default=HOURLY_RETENTION_DAYS,
+        help="Whole days older than this are kept at daily resolution only",
+    )
+    parser.add_argument("--keep-days", type=int, default=None, help="Also drop daily rows older than this")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute both rollups from the match log")
+    parser.add_argument("--dry-run", action="store_true", help="Report row counts without writing")
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    with session_scope() as session:
+        service = ActivityService(session)
+
+        if args.rebuild:
+            written = service.rebuild(now=now, hourly_days=args.hourly_days)
+            print(f"Rebuilt {written} rollup rows")
+        else:
+            folded = service.compact(now=now, hourly_days=args.hourly_days)
+            print(f"Folded {folded} hourly rows into daily rollups")
+
+        if args.keep_days is not None:
+            pruned = service.prune(args.keep_days, now=now)
+            print(f"Dropped {pruned} daily rows")
+
+        if args.dry_run:
+            session.rollback()
+            print("Dry run: nothing written.")
+
+    print(f"Done in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,25 @@
 import argparse
 import os
+import random
+import re
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import date
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from pydantic import BaseModel, Field, constr
-from google import genai
 from sqlmodel import select
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    # Imported where the real client is built, so --fake-gemini and the tests don't need the SDK
+    from google import genai
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 BACKEND_DIR = REPO_ROOT / "backend"
 
@@ -23,6 +32,7 @@ sys.path.append(str(BACKEND_DIR))
 
 from app.db.database import session_scope  # noqa: E402
 from app.models.brand import Brand  # noqa: E402
+from app.services.regions import set_brand_regions  # noqa: E402
 
 
 class BrandSchema(BaseModel):
@@ -66,13 +76,88 @@ def load_brand_names(args: argparse.Namespace) -> List[str]:
     return unique
 
 
-def generate_brand_data(client: genai.Client, brand_name: str, retries: int = 3) -> BrandSchema:
+class TokenBucket:
+    """
+    Thread-safe limiter: at most `rate_per_minute` acquisitions per minute on
+    average, with bursts of up to `burst`. acquire() blocks until allowed.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.interval = 60.0 / rate_per_minute
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.interval
+            time.sleep(wait)
+
+
+class FakeGeminiClient:
+    """
+    Offline stand-in for genai.Client (client.models.generate_content) for
+    trying the pipeline without an API key or quota. Answers after `latency`
+    seconds with made-up details and fails `failure_rate` of calls.
+    """
+
+    def __init__(self, latency: float = 0.2, failure_rate: float = 0.0, seed: Optional[int] = None):
+        self.models = self
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+
+    def generate_content(self, model: str, contents: str, config: dict) -> SimpleNamespace:
+        time.sleep(self.latency)
+        if self._rng.random() < self.failure_rate:
+            raise RuntimeError("fake Gemini failure")
+        match = re.search(r"boba chain: (.+)", contents)
+        name = match.group(1).strip() if match else "Unknown"
+        return SimpleNamespace(parsed=BrandSchema(
+            name=name,
+            country_of_origin="TW",
+            total_locations=self._rng.randint(1, 500),
+            regions_present=["TW"],
+            description=f"{name} (generated offline by the fake Gemini client).",
+        ))
+
+
+def load_checkpoint(path: Optional[Path]) -> set:
+    if path is None or not path.exists():
+        return set()
+    return {line.strip() for line in path.read_text().splitlines() if line.strip()}
+
+
+def append_checkpoint(path: Optional[Path], names: Iterable[str]) -> None:
+    """Records names whose brands are committed, so reruns skip them."""
+    if path is None:
+        return
+    with path.open("a") as handle:
+        for name in names:
+            handle.write(f"{name}\n")
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def generate_brand_data(
+    client: "genai.Client", brand_name: str, retries: int = 3, limiter: Optional[TokenBucket] = None
+) -> BrandSchema:
     prompt = f"""Provide comprehensive database details for the boba chain: {brand_name}
 
 IMPORTANT: For regions_present, use short country/region codes (e.g., CA, USA, CHN, EU, AUS, TW, SG, JP, KR, UK, FR, DE, MY, PH, ID) instead of full names like "Canada" or "United States". Use standard country codes or common abbreviations."""
     last_error: Exception | None = None
 
     for attempt in range(1, retries + 1):
+        if limiter is not None:
+            limiter.acquire()
         try:
             response = client.models.generate_content(
                 model="gemini-3-flash-preview",
@@ -95,26 +180,87 @@ IMPORTANT: For regions_present, use short country/region codes (e.g., CA, USA, C
     raise RuntimeError("Failed to generate brand data")
 
 
-def upsert_brand(brand_data: BrandSchema) -> str:
-    with session_scope() as session:
-        existing = session.exec(select(Brand).where(Brand.name == brand_data.name)).first()
-        if existing:
-            for key, value in brand_data.model_dump().items():
-                setattr(existing, key, value)
-            session.add(existing)
-            return "updated"
+def generate_brands(
+    client: "genai.Client",
+    names: Iterable[str],
+    retries: int = 3,
+    limiter: Optional[TokenBucket] = None,
+    concurrency: int = 4,
+) -> Iterator[Tuple[str, Optional[BrandSchema], Optional[BaseException]]]:
+    """
+    Yields (name, brand data, error) as Gemini calls complete, exactly one of
+    data and error being set. At most 2 x concurrency calls are queued at a
+    time, so closing the generator early (Ctrl-C, a crash) cancels only those
+    instead of running and discarding the rest of the list.
+    """
+    concurrency = max(1, concurrency)
+    names = iter(names)
+    in_flight: Dict[Future, str] = {}
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        while True:
+            for name in islice(names, 2 * concurrency - len(in_flight)):
+                in_flight[pool.submit(generate_brand_data, client, name, retries, limiter)] = name
+            if not in_flight:
+                return
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = in_flight.pop(future)
+                error = future.exception()
+                yield name, None if error else future.result(), error
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
 
-        brand = Brand(**brand_data.model_dump())
-        session.add(brand)
-        return "inserted"
+
+def upsert_brands(batch: List[BrandSchema]) -> Tuple[int, int]:
+    """
+    Inserts or updates a batch of brands (matched by name) in one
+    transaction with a single lookup. Returns (inserted, updated).
+    """
+    by_name = {brand_data.name: brand_data for brand_data in batch}
+    inserted = updated = 0
+    with session_scope() as session:
+        existing = {
+            brand.name: brand
+            for brand in session.exec(select(Brand).where(Brand.name.in_(list(by_name)))).all()
+        }
+        for name, brand_data in by_name.items():
+            brand = existing.get(name)
+            if brand:
+                for key, value in brand_data.model_dump().items():
+                    setattr(brand, key, value)
+                updated += 1
+            else:
+                brand = Brand(**brand_data.model_dump())
+                inserted += 1
+            session.add(brand)
+            set_brand_regions(session, brand.id, brand.regions_present)
+    return inserted, updated
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Populate brands table using Gemini structured output.")
     parser.add_argument("names", nargs="*", help="Brand names to populate")
     parser.add_argument("--file", help="Path to a text file with one brand name per line")
-    parser.add_argument("--delay", type=float, default=1.0, help="Delay between requests in seconds")
+    parser.add_argument("--rpm", type=float, default=60.0, help="Maximum Gemini requests per minute")
+    parser.add_argument("--concurrency", type=int, default=4, help="Gemini requests in flight at once")
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=None,
+        help="Legacy: minimum seconds between requests (caps --rpm at 60/delay)",
+    )
     parser.add_argument("--retries", type=int, default=3, help="Number of retries for Gemini calls")
+    parser.add_argument("--batch-size", type=int, default=25, help="Brands written per database transaction")
+    parser.add_argument(
+        "--checkpoint",
+        help="File of names already written; they are skipped and new ones appended "
+        "(default: <file>.checkpoint with --file)",
+    )
+    parser.add_argument("--no-checkpoint", action="store_true", help="Neither read nor write a checkpoint")
+    parser.add_argument("--fake-gemini", action="store_true", help="Use the offline fake client instead of Gemini")
+    parser.add_argument("--fake-latency", type=float, default=0.2, help="Seconds per fake Gemini call")
+    parser.add_argument("--fake-failure-rate", type=float, default=0.0, help="Share of fake Gemini calls that fail")
     args = parser.parse_args()
 
     brand_names = load_brand_names(args)
@@ -122,31 +268,68 @@ def main() -> int:
         print("No brand names provided. Pass names or --file.")
         return 1
 
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise RuntimeError("GEMINI_API_KEY environment variable is required.")
+    checkpoint_path: Optional[Path] = None
+    if not args.no_checkpoint:
+        if args.checkpoint:
+            checkpoint_path = Path(args.checkpoint)
+        elif args.file:
+            checkpoint_path = Path(f"{args.file}.checkpoint")
+
+    done = load_checkpoint(checkpoint_path)
+    pending = [name for name in brand_names if name not in done]
+    if done:
+        print(f"Skipping {len(brand_names) - len(pending)} names already in {checkpoint_path}")
 
-    client = genai.Client(api_key=api_key)
+    if args.fake_gemini:
+        client = FakeGeminiClient(latency=args.fake_latency, failure_rate=args.fake_failure_rate)
+    else:
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise RuntimeError("GEMINI_API_KEY environment variable is required.")
+        from google import genai
+
+        client = genai.Client(api_key=api_key)
+
+    rpm = args.rpm if args.delay is None else min(args.rpm, 60.0 / args.delay)
+    limiter = TokenBucket(rpm, burst=args.concurrency)
 
     inserted = 0
     updated = 0
     failed: List[Tuple[str, str]] = []
+    batch: List[Tuple[str, BrandSchema]] = []
 
-    for index, name in enumerate(brand_names, start=1):
-        print(f"[{index}/{len(brand_names)}] Generating data for: {name}")
+    def flush() -> None:
+        nonlocal inserted, updated
+        if not batch:
+            return
         try:
-            brand_data = generate_brand_data(client, name, retries=args.retries)
-            result = upsert_brand(brand_data)
-            if result == "inserted":
-                inserted += 1
-            else:
-                updated += 1
-            print(f"  -> {result}")
+            batch_inserted, batch_updated = upsert_brands([brand_data for _, brand_data in batch])
         except Exception as exc:  # noqa: BLE001
-            failed.append((name, str(exc)))
-            print(f"  -> failed: {exc}")
+            failed.extend((name, f"database write failed: {exc}") for name, _ in batch)
+            print(f"  -> failed to write {len(batch)} brands: {exc}")
+        else:
+            inserted += batch_inserted
+            updated += batch_updated
+            append_checkpoint(checkpoint_path, [name for name, _ in batch])
+            print(f"  -> wrote {len(batch)} brands ({batch_inserted} inserted, {batch_updated} updated)")
+        batch.clear()
+
+    results = generate_brands(client, pending, args.retries, limiter, args.concurrency)
+    try:
+        for index, (name, brand_data, error) in enumerate(results, start=1):
+            if error is None:
+                batch.append((name, brand_data))
+                print(f"[{index}/{len(pending)}] Generated data for: {name}")
+            else:
+                failed.append((name, str(error)))
+                print(f"[{index}/{len(pending)}] Failed: {name}: {error}")
 
-        time.sleep(args.delay)
+            if len(batch) >= args.batch_size:
+                flush()
+    finally:
+        # On Ctrl-C or an error: drop the queued calls, keep what already finished
+        results.close()
+        flush()
 
     print("\nSummary")
     print(f"Inserted: {inserted}")
@@ -0,0 +1,42 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = REPO_ROOT / "backend"
+
+# Load environment variables from backend/.env file
+env_path = BACKEND_DIR / ".env"
+if env_path.exists():
+    load_dotenv(env_path)
+
+sys.path.append(str(BACKEND_DIR))
+
+from app.db.database import session_scope  # noqa: E402
+from app.services.head_to_head import HeadToHeadService  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Recompute the head_to_head table from the matches table."
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Rebuild and report without writing")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with session_scope() as session:
+        pairs = HeadToHeadService(session).rebuild()
+        print(f"Rebuilt {pairs} pairs in {time.perf_counter() - started:.2f}s")
+
+        if args.dry_run:
+            session.rollback()
+            print("Dry run: nothing written.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
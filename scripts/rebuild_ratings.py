@@ -0,0 +1,102 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = REPO_ROOT / "backend"
+
+# Load environment variables from backend/.env file
+env_path = BACKEND_DIR / ".env"
+if env_path.exists():
+    load_dotenv(env_path)
+
+sys.path.append(str(BACKEND_DIR))
+
+from app.db.database import session_scope  # noqa: E402
+from app.services.rating_rebuild import CHUNK_SIZE, RatingRebuildService  # noqa: E402
+
+
+def run_elo_replay(service: RatingRebuildService, args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    brand_ids, replay = service.replay_elo(initial_elo=args.initial_elo, chunk_size=args.chunk_size)
+    replayed = int((replay.wins + replay.losses + replay.ties).sum()) // 2
+    print(f"Replayed {replayed} matches over {len(brand_ids)} brands in {time.perf_counter() - started:.2f}s")
+
+    if not args.dry_run:
+        started = time.perf_counter()
+        service.write_elo(brand_ids, replay)
+        print(f"Wrote {len(brand_ids)} brands in {time.perf_counter() - started:.2f}s")
+
+
+def run_bradley_terry(service: RatingRebuildService, args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    brand_ids, ratings, iterations = service.fit_bradley_terry(
+        warm_start=not args.cold_start, chunk_size=args.chunk_size
+    )
+    print(f"Fitted {len(brand_ids)} brands in {iterations} iterations, {time.perf_counter() - started:.2f}s")
+
+    if not args.dry_run:
+        started = time.perf_counter()
+        service.write_bt(brand_ids, ratings)
+        print(f"Wrote {len(brand_ids)} brands in {time.perf_counter() - started:.2f}s")
+
+
+def run_regional_replay(service: RatingRebuildService, args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    brand_ids, regions, replay = service.replay_regional(initial_elo=args.initial_elo, chunk_size=args.chunk_size)
+    replayed = int((replay.wins + replay.losses + replay.ties).sum()) // 2
+    print(f"Replayed {replayed} matches over {len(regions)} regions in {time.perf_counter() - started:.2f}s")
+
+    if not args.dry_run:
+        started = time.perf_counter()
+        written = service.write_regional(brand_ids, regions, replay)
+        print(f"Wrote {written} regional ratings in {time.perf_counter() - started:.2f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Recompute brand ratings from the matches table."
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["elo", "bt", "regional"],
+        default="elo",
+        help="elo: replay sequential Elo into elo/tier/wins/losses/ties. "
+        "bt: fit Bradley-Terry over all matches into bt_rating. "
+        "regional: replay each location_country's votes into regional_ratings.",
+    )
+    parser.add_argument("--initial-elo", type=int, default=1200, help="Starting rating for every brand (elo, regional)")
+    parser.add_argument("--cold-start", action="store_true", help="Ignore the previous fit (bt)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Matches fetched per cursor round trip")
+    parser.add_argument("--dry-run", action="store_true", help="Replay and report without writing")
+    parser.add_argument(
+        "--no-lock",
+        action="store_true",
+        help="Don't lock the brands table (votes recorded during the rebuild will be overwritten)",
+    )
+    args = parser.parse_args()
+
+    with session_scope() as session:
+        service = RatingRebuildService(session)
+        if args.engine in ("elo", "regional") and not args.dry_run and not args.no_lock:
+            service.lock_brands()
+
+        if args.engine == "bt":
+            run_bradley_terry(service, args)
+        elif args.engine == "regional":
+            run_regional_replay(service, args)
+        else:
+            run_elo_replay(service, args)
+
+        if args.dry_run:
+            session.rollback()
+            print("Dry run: nothing written.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = REPO_ROOT / "backend"
+
+# Load environment variables from backend/.env file
+env_path = BACKEND_DIR / ".env"
+if env_path.exists():
+    load_dotenv(env_path)
+
+sys.path.append(str(BACKEND_DIR))
+
+from app.db.database import session_scope  # noqa: E402
+from app.services.rating_history import (  # noqa: E402
+    FULL_RESOLUTION_DAYS,
+    TREND_WINDOW,
+    RatingHistoryService,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Snapshot brand ratings, refresh elo_trend/rank_trend and compact old history. "
+        "Run it on a schedule, e.g. hourly from cron."
+    )
+    parser.add_argument(
+        "--trend-window-hours",
+        type=float,
+        default=TREND_WINDOW.total_seconds() / 3600,
+        help="Trends compare against each brand's snapshot this long ago",
+    )
+    parser.add_argument(
+        "--full-resolution-days",
+        type=int,
+        default=FULL_RESOLUTION_DAYS,
+        help="Older snapshots are downsampled to one per brand per day",
+    )
+    parser.add_argument("--no-compact", action="store_true", help="Skip downsampling old snapshots")
+    parser.add_argument("--dry-run", action="store_true", help="Report row counts without writing")
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    with session_scope() as session:
+        service = RatingHistoryService(session)
+
+        written = service.snapshot(taken_at=now)
+        print(f"Snapshotted {written} changed brands")
+
+        updated = service.update_trends(now=now, window=timedelta(hours=args.trend_window_hours))
+        print(f"Updated trends for {updated} brands")
+
+        if not args.no_compact:
+            deleted = service.compact(now=now, full_resolution_days=args.full_resolution_days)
+            print(f"Compacted {deleted} old snapshots")
+
+        if args.dry_run:
+            session.rollback()
+            print("Dry run: nothing written.")
+
+    print(f"Done in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""
+Offline checks for populate_brands.py, driven by its fake Gemini client.
+No API key needed; the database writes are replaced with a recorder.
+
+    python scripts/test_populate_brands.py   (or: pytest scripts/test_populate_brands.py)
+"""
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import populate_brands  # noqa: E402
+from populate_brands import FakeGeminiClient, generate_brands, load_checkpoint  # noqa: E402
+
+NAMES = [f"Test Boba {i}" for i in range(20)]
+
+
+class CountingClient(FakeGeminiClient):
+    """Fake client that records how many calls were made."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+        self._count_lock = threading.Lock()
+
+    def generate_content(self, model, contents, config):
+        with self._count_lock:
+            self.calls += 1
+        return super().generate_content(model, contents, config)
+
+
+def test_every_name_yielded_once():
+    client = FakeGeminiClient(latency=0.01, failure_rate=0.3, seed=7)
+    results = list(generate_brands(client, NAMES, retries=1, concurrency=4))
+
+    assert sorted(name for name, _, _ in results) == sorted(NAMES)
+    for name, brand_data, error in results:
+        assert (brand_data is None) != (error is None)
+        if brand_data is not None:
+            assert brand_data.name == name
+    assert any(error is not None for _, _, error in results), "seeded failures should show up"
+    print(f"   ✅ {len(results)} results, {sum(e is not None for _, _, e in results)} failures")
+
+
+def test_closing_early_cancels_queued_calls():
+    client = CountingClient(latency=0.05)
+    results = generate_brands(client, NAMES, retries=1, concurrency=2)
+    next(results)
+    results.close()
+
+    # Only the bounded window (2 x concurrency) was ever queued
+    assert client.calls <= 4, f"{client.calls} calls ran after closing"
+    print(f"   ✅ {client.calls} calls ran, {len(NAMES) - client.calls} never started")
+
+
+def test_interrupt_flushes_finished_batch():
+    written = []
+
+    def fake_upsert(batch):
+        written.extend(brand_data.name for brand_data in batch)
+        return len(batch), 0
+
+    def interrupted(*args, **kwargs):
+        for count, result in enumerate(generate_brands(*args, **kwargs), start=1):
+            yield result
+            if count == 3:
+                raise KeyboardInterrupt
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = Path(tmp) / "names.checkpoint"
+        argv, upsert, generate = sys.argv, populate_brands.upsert_brands, populate_brands.generate_brands
+        sys.argv = [
+            "populate_brands.py", *NAMES, "--fake-gemini", "--fake-latency", "0.01",
+            "--rpm", "100000", "--retries", "1", "--batch-size", "10", "--checkpoint", str(checkpoint),
+        ]
+        populate_brands.upsert_brands = fake_upsert
+        populate_brands.generate_brands = interrupted
+        try:
+            populate_brands.main()
+        except KeyboardInterrupt:
+            pass
+        else:
+            raise AssertionError("main() swallowed the interrupt")
+        finally:
+            sys.argv, populate_brands.upsert_brands, populate_brands.generate_brands = argv, upsert, generate
+
+        # The three finished brands were written and checkpointed before exiting
+        assert len(written) == 3, written
+        assert load_checkpoint(checkpoint) == set(written)
+    print(f"   ✅ interrupted after 3 results, wrote {written}")
+
+
+if __name__ == "__main__":
+    print("\n🧋 populate_brands with the fake Gemini client")
+    test_every_name_yielded_once()
+    test_closing_early_cancels_queued_calls()
+    test_interrupt_flushes_finished_batch()